@@ -1,3 +1,5 @@
+import importlib
+
 from .config import (
     AVAILABLE_MODELS,
     DEFAULT_MODEL,
@@ -8,7 +10,12 @@ from .config import (
     PROCESSING_CONFIG,
     VISUALIZATION_CONFIG,
     LINE_CONFIG,
+    COLOR_MAPPINGS,
+    COLOR_KEYS,
+    color_for,
+    color_index,
     DEFAULT_CONFIGS,
+    DEFAULT_CONFIG,
     DEFAULT_CONFIG_KEY,
     STORAGE_KEY,
     BASE_DIR,
@@ -19,30 +26,48 @@ from .config import (
     SA_FILE,
     VIDEO_COMPRESSOR,
     IMAGE_COMPRESSOR,
+    TORCH_COMPILE,
+    TORCH_COMPILE_MODE,
+    TENSORRT_ENGINE,
     CURRENT_CONFIG_NAME,
     IMAGE_UPLOAD_SESSION_KEY,
 )   
 
-from .config_manager import (
-    FileStorageManager
-)
-
-from .model import (
-    get_model_path,
-    switch_model,
-)
-
-from .language import (
-    LANGUAGES,
-    get_text
-)
-
-from .page import (
-    PAGES,
-    switch_page,
-)
+# 延遲載入：只有在第一次存取時才匯入對應子模組（PEP 562）
+_LAZY_ATTRS = {
+    # from page
+    "PAGES": (".page", "PAGES"),
+    "switch_page": (".page", "switch_page"),
+    # from model
+    "get_model_path": (".model", "get_model_path"),
+    "switch_model": (".model", "switch_model"),
+    # from language
+    "LANGUAGES": (".language", "LANGUAGES"),
+    "LANGUAGE_CODES": (".language", "LANGUAGE_CODES"),
+    "get_text": (".language", "get_text"),
+    "get_translations": (".language", "get_translations"),
+    "get_help": (".language", "get_help"),
+    "preload_languages": (".language", "preload"),
+    "get_labels": (".language", "get_labels"),
+    "get_colors": (".language", "get_colors"),
+    "K": (".label_keys", "K"),
+    # from config_manager
+    "CurrentConfig": (".config_manager", "CurrentConfig"),
+    "get_file_storage_manager": (".config_manager", "get_file_storage_manager"),
+}
 
-file_storage_manager = FileStorageManager()
+def __getattr__(name):
+    if name == "file_storage_manager":
+        from .config_manager import get_file_storage_manager
+        value = get_file_storage_manager()
+    elif name in _LAZY_ATTRS:
+        module_name, attr = _LAZY_ATTRS[name]
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # 快取到模組命名空間，之後的存取不再經過 __getattr__
+    globals()[name] = value
+    return value
 
 __all__ = [
     # from config
@@ -55,7 +80,12 @@ __all__ = [
     "PROCESSING_CONFIG",
     "VISUALIZATION_CONFIG",
     "LINE_CONFIG",
+    "COLOR_MAPPINGS",
+    "COLOR_KEYS",
+    "color_for",
+    "color_index",
     "DEFAULT_CONFIGS",
+    "DEFAULT_CONFIG",
     "DEFAULT_CONFIG_KEY",
     "STORAGE_KEY",
     "BASE_DIR",
@@ -66,6 +96,9 @@ __all__ = [
     "SA_FILE",
     "VIDEO_COMPRESSOR",
     "IMAGE_COMPRESSOR",
+    "TORCH_COMPILE",
+    "TORCH_COMPILE_MODE",
+    "TENSORRT_ENGINE",
     "CURRENT_CONFIG_NAME",
     "IMAGE_UPLOAD_SESSION_KEY",
     # from page
@@ -73,7 +106,9 @@ __all__ = [
     "switch_page",
     
     # from config_manager
+    "CurrentConfig",
     "file_storage_manager",
+    "get_file_storage_manager",
     
     # from model
     "get_model_path",
@@ -81,5 +116,12 @@ __all__ = [
     
     # from language
     "LANGUAGES",
-    "get_text"
+    "LANGUAGE_CODES",
+    "get_text",
+    "get_translations",
+    "get_help",
+    "preload_languages",
+    "get_labels",
+    "get_colors",
+    "K",
 ]
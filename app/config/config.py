@@ -1,7 +1,19 @@
+import os
+import sys
 from pathlib import Path
-
-# 路徑配置
-BASE_DIR = Path(__file__).resolve().parents[2]
+from types import MappingProxyType
+from typing import Tuple
+
+def _freeze(d: dict) -> MappingProxyType:
+    """intern 所有 key 並包成唯讀 MappingProxyType（巢狀 dict 一併處理），避免常數被複製或修改"""
+    return MappingProxyType({
+        sys.intern(k): _freeze(v) if isinstance(v, dict) else v
+        for k, v in d.items()
+    })
+
+# 路徑配置（abspath 只做字串正規化，不像 resolve() 需逐層 stat/readlink）
+_BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BASE_DIR = Path(_BASE)
 TEMP_DIR = BASE_DIR / "temp"
 OUTPUT_DIR = BASE_DIR / "output"
 MODELS_DIR = BASE_DIR / "models"
@@ -36,6 +48,14 @@ TARGET_FPS = 10
 VIDEO_COMPRESSOR = True
 # 是否壓縮圖片
 IMAGE_COMPRESSOR = True
+# 是否以 torch.compile 編譯模型（載入時一次性成本，失敗會自動退回 eager）
+TORCH_COMPILE = True
+# torch.compile 模式："reduce-overhead" 會以 CUDA Graph 重播整個前向傳遞，省去逐一啟動 kernel 的開銷
+# （輸入固定為 letterbox 後的 TARGET_SIZE，但每個不同的批次大小各錄一份 graph、佔用額外顯存；
+#  CUDA Graph 不適合多個執行緒同時推論，多人同時使用時維持 "default"）
+TORCH_COMPILE_MODE = "default"
+# 是否匯出並改用 TensorRT FP16 engine（首次載入需數分鐘匯出，之後直接讀取權重旁的 .engine 快取）
+TENSORRT_ENGINE = False
 
 # 儲存設定到瀏覽器的 key
 STORAGE_KEY = "vessel_saved_configs"
@@ -45,7 +65,7 @@ CURRENT_CONFIG_NAME = "current_config_name"
 IMAGE_UPLOAD_SESSION_KEY = "image_uploader_cache"
 
 # 模型配置
-YOLO_CONFIG = {
+YOLO_CONFIG = _freeze({
     "imgsz": 640,
     "conf": 0.4,
     "iou": 0.1,
@@ -56,15 +76,15 @@ YOLO_CONFIG = {
     "stream": False,
     "retina_masks": True,
     "half": True,
-}
+})
 
 # 處理配置
-PROCESSING_CONFIG = {
+PROCESSING_CONFIG = _freeze({
     "pixel_size_mm": 0.05,  # 圖片像素大小 (mm)
-}
+})
 
 # 視覺化配置
-VISUALIZATION_CONFIG = {
+VISUALIZATION_CONFIG = _freeze({
     "line_color": (255, 255, 255),  # 線條顏色
     "line_thickness": 1,            # 線條粗細
     "line_alpha": 0.7,              # 線條透明度
@@ -74,29 +94,41 @@ VISUALIZATION_CONFIG = {
     "show_points": False,           # 顯示點
     "display_labels": True,         # 顯示標籤
     "region_limit": True,          # 是否開啟區域限制
-}
+})
 
 # 線條提取配置
-LINE_CONFIG = {
+LINE_CONFIG = _freeze({
     "sample_interval": 5,         # x 軸採樣步距
     "gradient_search_top": 5,     # 往上搜尋的最大像素距離
     "gradient_search_bottom": 5,  # 往下搜尋的最大像素距離
     "keep_ratio": 0.3,           # 保留的寬度比例
     "window_size": 5,             # 平滑過濾視窗大小
     "threshold": 0.1,             # 平滑過濾閾值
-}
-
-# 線條顏色選擇
-COLOR_MAPPINGS = {
-    '綠色': (0, 255, 0),
-    '紅色': (0, 0, 255),
-    '藍色': (255, 0, 0),
-    '白色': (255, 255, 255),
-    '黃色': (0, 255, 255),
-}
+})
+
+# 線條顏色選擇 (使用語言無關的 key，顯示名稱由翻譯提供；值為 BGR)
+COLOR_MAPPINGS = _freeze({
+    'color_green': (0, 255, 0),
+    'color_red': (0, 0, 255),
+    'color_blue': (255, 0, 0),
+    'color_white': (255, 255, 255),
+    'color_yellow': (0, 255, 255),
+})
+# 顏色查表：key -> index -> BGR tuple，未知 key 退回第一個顏色（綠色）
+COLOR_KEYS = tuple(COLOR_MAPPINGS)
+_COLOR_LUT = tuple(COLOR_MAPPINGS.values())
+_COLOR_IDX = {name: i for i, name in enumerate(COLOR_KEYS)}
+
+def color_index(name: str) -> int:
+    """顏色 key 在 COLOR_KEYS 中的位置（選單預設值用），未知 key 為 0"""
+    return _COLOR_IDX.get(name, 0)
+
+def color_for(name: str) -> Tuple[int, int, int]:
+    """依語言無關的顏色 key 取得 BGR 顏色"""
+    return _COLOR_LUT[color_index(name)]
 
 # 畫布配置
-CANVAS_CONFIG = {
+CANVAS_CONFIG = _freeze({
     # 畫布預設框框大小
     "rect_width": 500,
     "rect_height": 300,
@@ -104,12 +136,12 @@ CANVAS_CONFIG = {
     # 畫布大小上限
     "max_canvas_w": 800,
     "max_canvas_h": 600,
-}
+})
 
 # 預設設定組合 (使用語言無關的 key)
 DEFAULT_CONFIG_KEY = "default"
 
-DEFAULT_CONFIGS = {
+DEFAULT_CONFIGS = _freeze({
     DEFAULT_CONFIG_KEY: {
         "selected_model": DEFAULT_MODEL,
         "pixel_size_mm": PROCESSING_CONFIG["pixel_size_mm"],
@@ -126,4 +158,7 @@ DEFAULT_CONFIGS = {
         "rect_height": CANVAS_CONFIG["rect_height"],
         "line_color_option": "color_green",  # 使用語言無關的 key
     }
-}
\ No newline at end of file
+})
+
+# 預設設定本身（與 DEFAULT_CONFIGS[DEFAULT_CONFIG_KEY] 為同一物件），省去重複的 key 查找
+DEFAULT_CONFIG = DEFAULT_CONFIGS[DEFAULT_CONFIG_KEY]
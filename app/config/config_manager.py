@@ -1,21 +1,91 @@
-import json
+import atexit
+import hashlib
 import os
 import tempfile
-from typing import Any
+import threading
+import time
+from collections import ChainMap
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Union
 
+import msgspec
+from msgspec import UNSET, UnsetType
+import orjson
 import streamlit as st
 from filelock import FileLock
 
 from .config import (
     DEFAULT_CONFIGS,
-    DEFAULT_CONFIG_KEY,
+    DEFAULT_CONFIG,
     STORAGE_KEY,
     STORAGE_DIR,
     CONFIG_FILE,
     CURRENT_CONFIG_NAME,
 )
+
+class CurrentConfig(NamedTuple):
+    """目前生效的配置參數（欄位與 DEFAULT_CONFIGS 預設設定的 key 一致）"""
+    selected_model: str
+    pixel_size_mm: float
+    confidence_threshold: float
+    sample_interval: int
+    gradient_search_top: int
+    gradient_search_bottom: int
+    keep_ratio: float
+    line_thickness: int
+    line_alpha: float
+    display_labels: bool
+    region_limit: bool
+    rect_width: int
+    rect_height: int
+    line_color_option: str
+
+# 只提取可序列化的配置 key（基於 DEFAULT_CONFIGS 定義的 key）
+_ALLOWED_KEYS = CurrentConfig._fields
+# 預設設定對應的 CurrentConfig（不可變，可直接重複使用）
+_DEFAULT_CURRENT_CONFIG = CurrentConfig(**DEFAULT_CONFIG)
+
+class UserConfig(msgspec.Struct, forbid_unknown_fields=True):
+    """
+    配置檔中單一使用者配置的結構（只驗證型別）：
+    檔案中沒有的欄位維持 UNSET，不會在解碼時寫入目前的預設值（讀取端以 DEFAULT_CONFIG 補齊，預設值變更時舊設定會跟著更新）；
+    含未知欄位（例如較新版本寫入的 key）時解碼失敗，改由 orjson 原樣保留
+    """
+    selected_model: Union[str, UnsetType] = UNSET
+    pixel_size_mm: Union[float, UnsetType] = UNSET
+    confidence_threshold: Union[float, UnsetType] = UNSET
+    sample_interval: Union[int, UnsetType] = UNSET
+    gradient_search_top: Union[int, UnsetType] = UNSET
+    gradient_search_bottom: Union[int, UnsetType] = UNSET
+    keep_ratio: Union[float, UnsetType] = UNSET
+    line_thickness: Union[int, UnsetType] = UNSET
+    line_alpha: Union[float, UnsetType] = UNSET
+    display_labels: Union[bool, UnsetType] = UNSET
+    region_limit: Union[bool, UnsetType] = UNSET
+    rect_width: Union[int, UnsetType] = UNSET
+    rect_height: Union[int, UnsetType] = UNSET
+    line_color_option: Union[str, UnsetType] = UNSET
+
+# 配置檔的頂層結構：STORAGE_KEY 對應配置表（舊版為 JSON 字串），CURRENT_CONFIG_NAME 對應名稱
+_CONFIG_FILE_DECODER = msgspec.json.Decoder(
+    Dict[str, Union[Dict[str, UserConfig], str, None]]
+)
+_CONFIG_FILE_ENCODER = msgspec.json.Encoder()
+# 預設設定名稱集合（過濾用戶設定時使用）
+_DEFAULT_KEYSET = frozenset(DEFAULT_CONFIGS)
+# session_state 缺值的哨兵（None 本身是合法的配置值）
+_MISSING = object()
+# 可 JSON 序列化的基本類型
+_SERIALIZABLE_TYPES = (str, int, float, bool, list, dict, type(None))
+# 背景寫入的去抖動視窗（秒）
+_WRITE_DEBOUNCE_S = 0.1
+
 class FileStorageManager:
-    """檔案存儲管理器，負責處理配置的持久化存儲"""
+    """
+    檔案存儲管理器，負責處理配置的持久化存儲。
+    
+    只有寫入端持有 FileLock；讀取端依賴 os.replace 的原子性，不需上鎖。
+    """
     
     def __init__(self):
         """初始化檔案存儲管理器"""
@@ -25,6 +95,21 @@ class FileStorageManager:
         self.default_configs = DEFAULT_CONFIGS
         
         self._lock = FileLock(str(self.config_file) + ".lock", timeout=5)
+        
+        # 以 (mtime_ns, size) 為 key 的讀取快取，檔案未變動時不重新讀檔
+        self._cache = None
+        self._cache_stat = None
+        # 快取內容對應的檔案位元組摘要，用來略過內容相同的寫入
+        self._cache_digest = None
+        
+        # 背景寫入：_pending 為尚未落盤的最新內容
+        self._pending = None
+        # 最近一次背景寫入失敗的原因；內容仍保留在 _pending，下次讀取或儲存時回報並重試
+        self._write_error = None
+        self._write_cond = threading.Condition()
+        self._flush_mutex = threading.Lock()
+        self._write_thread = None
+        atexit.register(self._flush_sync)
     
     def _ensure_storage_dir(self):
         """確保存儲目錄存在"""
@@ -35,82 +120,206 @@ class FileStorageManager:
             st.error(f"無法建立存儲目錄: {str(e)}")
             return False
     
+    def _stat_key(self):
+        """回傳配置檔案的 (mtime_ns, size)，檔案不存在時回傳 None"""
+        try:
+            file_stat = self.config_file.stat()
+        except FileNotFoundError:
+            return None
+        return (file_stat.st_mtime_ns, file_stat.st_size)
+    
+    def _report_write_error(self):
+        """回報背景寫入的失敗（只回報一次），並讓背景執行緒重試寫入仍保留的內容"""
+        with self._write_cond:
+            error = self._write_error
+            if error is None:
+                return
+            self._write_error = None
+            self._write_cond.notify()
+        st.error(f"寫入配置檔案失敗: {error}")
+    
     def _read_config_file(self):
-        """讀取配置檔案"""
+        """讀取配置檔案（有尚未落盤的寫入時回傳該內容，檔案未變動時回傳快取內容）"""
+        self._report_write_error()
+        with self._write_cond:
+            if self._pending is not None:
+                return dict(self._pending)
+        # 讀取端不取 FileLock：寫入一律經由暫存檔 + os.replace 原子替換，
+        # open() 只會看到舊檔或新檔，不會讀到寫到一半的內容
         try:
-            if self.config_file.exists():
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {}
+            stat_key = self._stat_key()
+            if stat_key is None:
+                return {}
+            if stat_key != self._cache_stat:
+                with open(self.config_file, 'rb') as f:
+                    raw = f.read()
+                self._cache = self._decode(raw)
+                self._cache_digest = hashlib.blake2b(raw, digest_size=16).digest()
+                self._cache_stat = stat_key
+            # 呼叫端會修改頂層 key，回傳淺拷貝避免污染快取
+            return dict(self._cache)
         except Exception as e:
             st.error(f"讀取配置檔案失敗: {str(e)}")
             return {}
     
+    @staticmethod
+    def _decode(raw):
+        """解析配置檔內容（依 UserConfig 驗證；格式不符的舊檔退回 orjson 解析）"""
+        try:
+            data = msgspec.to_builtins(_CONFIG_FILE_DECODER.decode(raw))
+        except msgspec.ValidationError:
+            data = orjson.loads(raw)
+        # 舊版把配置表存成 JSON 字串：讀檔時解析一次並留在快取，之後的載入/儲存/刪除不必再各自解析
+        saved_configs = data.get(STORAGE_KEY) if isinstance(data, dict) else None
+        if isinstance(saved_configs, str):
+            try:
+                data[STORAGE_KEY] = orjson.loads(saved_configs)
+            except orjson.JSONDecodeError:
+                pass
+        return data
+    
     def _write_config_file(self, data):
-        """寫入配置檔案"""
+        """排入寫入配置檔案；短時間內的多次寫入會由背景執行緒合併成一次落盤"""
+        if not self._ensure_storage_dir():
+            return False
+        self._report_write_error()
+        with self._write_cond:
+            # 內容與快取（即磁碟上的檔案）相同時，不必再排入序列化與寫入
+            if (self._pending is None
+                    and self._cache_stat is not None
+                    and data == self._cache
+                    and self._stat_key() == self._cache_stat):
+                return True
+            self._pending = data
+            if self._write_thread is None:
+                self._write_thread = threading.Thread(
+                    target=self._writer_loop, name="config-writer", daemon=True
+                )
+                self._write_thread.start()
+            self._write_cond.notify()
+        return True
+    
+    def _writer_loop(self):
+        """背景寫入執行緒：等待寫入請求，經過去抖動視窗後只寫入最後一份內容"""
+        while True:
+            with self._write_cond:
+                # 寫入失敗後等到錯誤被回報（下次讀取或儲存）才重試，不在背景反覆重試
+                while self._pending is None or self._write_error is not None:
+                    self._write_cond.wait()
+            # 去抖動：讓視窗內的後續寫入覆蓋 _pending
+            time.sleep(_WRITE_DEBOUNCE_S)
+            self._flush_sync()
+    
+    def _flush_sync(self):
+        """立即將尚未落盤的內容寫入檔案（背景執行緒與程式結束時呼叫）"""
+        with self._flush_mutex:
+            with self._write_cond:
+                data = self._pending
+            if data is None:
+                return
+            error = self._write_to_disk(data)
+            with self._write_cond:
+                if error is not None:
+                    # 寫入失敗：內容保留在 _pending（讀取端仍看得到），記錄錯誤待下次回報
+                    self._write_error = error
+                # 寫入期間若有新的請求，保留給下一輪
+                elif self._pending is data:
+                    self._pending = None
+    
+    def _write_to_disk(self, data):
+        """寫入配置檔案（內容與磁碟上相同時略過寫入）；成功時回傳 None，失敗時回傳錯誤訊息"""
         try:
-            if not self._ensure_storage_dir():
-                return False
+            payload = msgspec.json.format(_CONFIG_FILE_ENCODER.encode(data), indent=2)
+            digest = hashlib.blake2b(payload, digest_size=16).digest()
+            if (digest == self._cache_digest
+                    and self._cache_stat is not None
+                    and self._stat_key() == self._cache_stat):
+                return None
+            
             with self._lock:
+                self._cache_stat = None
                 dirpath = str(self.storage_dir)
-                with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=dirpath, delete=False) as tmp:
-                    json.dump(data, tmp, ensure_ascii=False, indent=2)
-                    tmp.flush()
-                    os.fsync(tmp.fileno())
-                    tmp_name = tmp.name
-                os.replace(tmp_name, self.config_file)
-            return True
+                tmp_name = None
+                try:
+                    with tempfile.NamedTemporaryFile('wb', dir=dirpath, delete=False) as tmp:
+                        tmp_name = tmp.name
+                        tmp.write(payload)
+                        tmp.flush()
+                        os.fsync(tmp.fileno())
+                    os.replace(tmp_name, self.config_file)
+                    tmp_name = None
+                finally:
+                    # 寫入或替換失敗時移除殘留的暫存檔
+                    if tmp_name is not None:
+                        try:
+                            os.unlink(tmp_name)
+                        except OSError:
+                            pass
+                # 寫入者皆持有 FileLock，此時 stat 即對應剛寫入的內容
+                self._cache = data
+                self._cache_digest = digest
+                self._cache_stat = self._stat_key()
+            return None
         except Exception as e:
-            st.error(f"寫入配置檔案失敗: {str(e)}")
-            return False
+            # 在背景執行緒中沒有 Streamlit 的執行環境，先輸出到 log，由下次讀取或儲存時以 st.error 回報
+            print(f"寫入配置檔案失敗: {str(e)}")
+            return str(e)
     
     def initialize_session_state(self):
         """初始化 session state 配置值"""
         if 'config_initialized' not in st.session_state:
-            # 優先載入用戶已保存的當前配置
-            current_config_name = self.get_current_config_name()
+            # 優先載入用戶已保存的當前配置（只讀取一次檔案）
+            saved_data = self._read_config_file()
+            current_config_name = saved_data.get(CURRENT_CONFIG_NAME, None)
             if current_config_name:
-                saved_configs = self.load_saved_configs()
+                saved_configs = self._merge_saved_configs(saved_data)
                 config_to_apply = saved_configs.get(current_config_name, None)
                 if config_to_apply:
-                    for key, value in config_to_apply.items():
-                        if key not in st.session_state:
-                            st.session_state[key] = value
+                    # 設定中沒有的欄位以系統預設補齊
+                    self._fill_missing_session_values(ChainMap(config_to_apply, DEFAULT_CONFIG))
                     st.session_state.config_initialized = True
                     return
             
             # 如果沒有保存的配置，使用預設配置
-            default_config = self.default_configs[DEFAULT_CONFIG_KEY]
-            for key, value in default_config.items():
-                if key not in st.session_state:
-                    st.session_state[key] = value
+            self._fill_missing_session_values(DEFAULT_CONFIG)
             st.session_state.config_initialized = True
     
+    @staticmethod
+    def _fill_missing_session_values(config):
+        """只補上 session_state 中尚未存在的 key，一次 update 寫入"""
+        ss = st.session_state
+        missing = {key: value for key, value in config.items() if key not in ss}
+        if missing:
+            ss.update(missing)
+    
     def load_saved_configs(self):
         """從檔案載入保存的設定"""
+        return self._merge_saved_configs(self._read_config_file())
+    
+    def _merge_saved_configs(self, saved_data: dict):
+        """合併預設配置與已讀取的檔案內容中的用戶配置"""
         try:
-            # 讀取檔案中的用戶配置
-            saved_data = self._read_config_file()
+            # 取出檔案中的用戶配置
             saved_configs = saved_data.get(self.storage_key, {})
             
             if saved_configs:
                 # 處理可能的 JSON 字串或已解析的對象
                 if isinstance(saved_configs, str):
                     try:
-                        configs = json.loads(saved_configs)
-                    except json.JSONDecodeError:
+                        configs = orjson.loads(saved_configs.encode())
+                    except orjson.JSONDecodeError:
                         st.warning("配置數據格式錯誤，使用預設配置")
-                        return self.default_configs.copy()
+                        return dict(self.default_configs)
                 else:
                     configs = saved_configs
                 
                 # 合併預設配置和用戶配置
-                all_configs = self.default_configs.copy()
+                all_configs = dict(self.default_configs)
                 if isinstance(configs, dict):
                     all_configs.update(configs)
                 return all_configs
             else:
-                return self.default_configs.copy()
+                return dict(self.default_configs)
                 
         except Exception as e:
             st.error(f"載入設定失敗: {str(e)}")
@@ -120,7 +329,7 @@ class FileStorageManager:
                     self.config_file.unlink()
             except:
                 pass
-            return self.default_configs.copy()
+            return dict(self.default_configs)
     
     def save_data(self, key: str, value: Any):
         """儲存目前設定名稱"""
@@ -134,17 +343,29 @@ class FileStorageManager:
         del data_to_save[key]
         return self._write_config_file(data_to_save)
     
+    def _user_configs(self, saved_data: dict) -> dict:
+        """從已讀取的檔案內容取出用戶設定（排除預設設定），回傳可直接修改的新 dict"""
+        saved_configs = saved_data.get(self.storage_key) or {}
+        if isinstance(saved_configs, str):
+            try:
+                saved_configs = orjson.loads(saved_configs.encode())
+            except orjson.JSONDecodeError:
+                return {}
+        if not isinstance(saved_configs, dict):
+            return {}
+        return {k: v for k, v in saved_configs.items()
+                if k not in _DEFAULT_KEYSET}
+    
     def save_config_to_file(self, config_name: str, config: dict):
         """儲存設定到檔案"""
         try:
-            # 載入現有配置
-            current_configs = self.load_saved_configs()
-            user_configs = {k: v for k, v in current_configs.items() 
-                          if k not in self.default_configs}
-            user_configs[config_name] = config
-            
-            # 準備要寫入的數據
+            # 只讀取一次檔案，直接在用戶設定上更新，不需先合併預設設定再過濾
             data_to_save = self._read_config_file()
+            user_configs = self._user_configs(data_to_save)
+            # 預設設定為唯讀 MappingProxyType、目前設定為 CurrentConfig，皆轉回 dict 才能序列化
+            if isinstance(config, CurrentConfig):
+                config = config._asdict()
+            user_configs[config_name] = dict(config)
             data_to_save[self.storage_key] = user_configs
             
             # 寫入檔案
@@ -157,20 +378,15 @@ class FileStorageManager:
     def delete_config_from_file(self, config_name: str):
         """從檔案刪除設定"""
         try:
-            if config_name in self.default_configs:
+            if config_name in _DEFAULT_KEYSET:
                 return False  # 不能刪除預設設定
-                
-            current_configs = self.load_saved_configs()
-            user_configs = {k: v for k, v in current_configs.items() 
-                          if k not in self.default_configs}
+            
+            data_to_save = self._read_config_file()
+            user_configs = self._user_configs(data_to_save)
             
             if config_name in user_configs:
                 del user_configs[config_name]
-                
-                # 準備要寫入的數據
-                data_to_save = self._read_config_file()
                 data_to_save[self.storage_key] = user_configs
-                
                 return self._write_config_file(data_to_save)
             return False
             
@@ -179,44 +395,41 @@ class FileStorageManager:
             return False
     
     def apply_config(self, config):
-        """套用配置到控件"""
-        for key, value in config.items():
-            st.session_state[key] = value
+        """套用配置到控件（接受 dict 或 CurrentConfig）"""
+        if isinstance(config, CurrentConfig):
+            config = config._asdict()
+        st.session_state.update(config)
     
-    def get_current_config(self):
+    def get_current_config(self) -> CurrentConfig:
         """獲取當前的配置參數"""
-        current_config_name = self.get_current_config_name()
+        # 單次讀取同時取得目前設定名稱與已保存設定，避免兩次讀檔之間被寫入
+        saved_data = self._read_config_file()
+        current_config_name = saved_data.get(CURRENT_CONFIG_NAME, None)
         if current_config_name is None:
-            return DEFAULT_CONFIGS[DEFAULT_CONFIG_KEY].copy()
+            return _DEFAULT_CURRENT_CONFIG
         
-        current_config = self.load_saved_configs().get(current_config_name, None)
+        current_config = self._merge_saved_configs(saved_data).get(current_config_name, None)
         if not current_config:
             # 刪除不存在的設定
             self.delete_data(CURRENT_CONFIG_NAME)
-            return DEFAULT_CONFIGS[DEFAULT_CONFIG_KEY].copy()
+            return _DEFAULT_CURRENT_CONFIG
         
-        # 只提取可序列化的配置 key（基於 DEFAULT_CONFIGS 定義的 key）
-        valid_keys = set(DEFAULT_CONFIGS[DEFAULT_CONFIG_KEY].keys())
-        result_config = {}
-        
-        # 優先從 session_state 獲取值，若不存在則使用 current_config 的值
-        for key in valid_keys:
-            if key in st.session_state:
-                value = st.session_state[key]
-                # 確保值是可 JSON 序列化的基本類型
-                if isinstance(value, (str, int, float, bool, list, dict, type(None))):
-                    result_config[key] = value
-                elif key in current_config:
-                    result_config[key] = current_config[key]
-                else:
-                    result_config[key] = DEFAULT_CONFIGS[DEFAULT_CONFIG_KEY].get(key)
-            elif key in current_config:
-                result_config[key] = current_config[key]
-            else:
-                result_config[key] = DEFAULT_CONFIGS[DEFAULT_CONFIG_KEY].get(key)
-        
-        return result_config
+        # 優先序：session_state（僅限可 JSON 序列化的值） > current_config > 預設配置
+        # 每個 key 只經過一次 session_state proxy
+        ss = st.session_state
+        session_values = {}
+        for key in _ALLOWED_KEYS:
+            value = ss.get(key, _MISSING)
+            if value is not _MISSING and isinstance(value, _SERIALIZABLE_TYPES):
+                session_values[key] = value
+        lookup = ChainMap(session_values, current_config, DEFAULT_CONFIG)
+        return CurrentConfig._make(lookup[key] for key in _ALLOWED_KEYS)
 
     def get_current_config_name(self):
         """獲取當前的設定名稱"""
-        return self._read_config_file().get(CURRENT_CONFIG_NAME, None)
\ No newline at end of file
+        return self._read_config_file().get(CURRENT_CONFIG_NAME, None)
+
+@lru_cache(maxsize=1)
+def get_file_storage_manager() -> FileStorageManager:
+    """取得全域共用的檔案存儲管理器（每個 process 只建立一次）"""
+    return FileStorageManager()
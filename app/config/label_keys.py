@@ -0,0 +1,208 @@
+# 由 scripts/local/build_locales.py 自動產生，請勿手動修改
+from enum import IntEnum
+
+
+class K(IntEnum):
+    """翻譯 key 的固定索引，對應 get_labels() 回傳的 tuple"""
+
+    ANALYSIS_RESULTS = 0
+    APPLY_CONFIG = 1
+    DEFAULT_CONFIG_NAME = 2
+    AVAILABLE_MODELS = 3
+    AVERAGE_LENGTH = 4
+    BASIC_PARAMS = 5
+    BATCH_EFFICIENCY = 6
+    BATCH_PROCESSING = 7
+    BATCH_SIZE_INFO = 8
+    BATCHES_TEXT = 9
+    CLEAR_REGION = 10
+    CLEAR_RESULTS = 11
+    COLOR_BLUE = 12
+    COLOR_GREEN = 13
+    COLOR_RED = 14
+    COLOR_WHITE = 15
+    COLOR_YELLOW = 16
+    CONFIG_APPLIED = 17
+    CONFIG_DELETED = 18
+    CONFIG_NAME = 19
+    CONFIG_NAME_HELP = 20
+    CONFIG_NAME_PLACEHOLDER = 21
+    CONFIG_SAVED = 22
+    CONFIDENCE = 23
+    CONFIDENCE_THRESHOLD = 24
+    CONFIDENCE_THRESHOLD_HELP = 25
+    CURRENT_MODEL = 26
+    DELETE_CONFIG = 27
+    DISPLAY_LABELS = 28
+    DISPLAY_LABELS_HELP = 29
+    DOWNLOAD_COMPLETE = 30
+    DOWNLOAD_COMPLETE_HELP = 31
+    DOWNLOAD_CSV = 32
+    DOWNLOAD_CSV_HELP = 33
+    DOWNLOAD_EXCEL = 34
+    DOWNLOAD_EXCEL_HELP = 35
+    DOWNLOAD_RESULTS = 36
+    DOWNLOAD_SINGLE_IMAGE = 37
+    ENTER_CONFIG_NAME = 38
+    FAILED_IMAGES = 39
+    FILE_SIZE = 40
+    GRADIENT_SEARCH_BOTTOM = 41
+    GRADIENT_SEARCH_BOTTOM_HELP = 42
+    GRADIENT_SEARCH_TOP = 43
+    GRADIENT_SEARCH_TOP_HELP = 44
+    IMAGE_UPLOAD = 45
+    IMAGES_TEXT = 46
+    INTERACTIVE_SELECTION = 47
+    INTERACTIVE_SELECTION_HELP = 48
+    CANVAS_ADJUST_SELECTION = 49
+    CANVAS_WIDTH_LABEL = 50
+    CANVAS_HEIGHT_LABEL = 51
+    CANVAS_REGION_STATUS = 52
+    CANVAS_APPLY_REGION_BUTTON = 53
+    CANVAS_SELECTION_SAVED = 54
+    KEEP_RATIO = 55
+    KEEP_RATIO_HELP = 56
+    LANGUAGE_SELECTOR = 57
+    LINE_ALPHA = 58
+    LINE_ALPHA_HELP = 59
+    LINE_COLOR = 60
+    LINE_COLOR_HELP = 61
+    LINE_EXTRACTION = 62
+    LINE_THICKNESS = 63
+    LINE_THICKNESS_HELP = 64
+    MAIN_TITLE = 65
+    MAX_AVERAGE_LENGTH = 66
+    MEAN_LENGTH = 67
+    MEASUREMENT_DATA = 68
+    MIN_AVERAGE_LENGTH = 69
+    MODEL_FAILED = 70
+    MODEL_FILE = 71
+    MODEL_LOADED = 72
+    MODEL_NOT_LOADED = 73
+    MODEL_SELECTION = 74
+    MODEL_STATUS = 75
+    NUM_LINES = 76
+    PAGE_ICON = 77
+    PAGE_TITLE = 78
+    PAGE_IMAGES = 79
+    PAGE_VIDEOS = 80
+    PAGE_RESULTS = 81
+    NAV_LABEL = 82
+    PIXEL_SIZE = 83
+    PIXEL_SIZE_HELP = 84
+    PROCESS_ALL = 85
+    PROCESSING_COMPLETE = 86
+    PROCESSING_EFFICIENCY = 87
+    PROCESSING_FAILED = 88
+    RANGE = 89
+    REGION_LIMIT = 90
+    REGION_LIMIT_HELP = 91
+    SAMPLE_INTERVAL = 92
+    SAMPLE_INTERVAL_HELP = 93
+    SAVE_CONFIG = 94
+    SAVE_CURRENT_CONFIG = 95
+    SELECT_CONFIG = 96
+    SELECT_CONFIG_HELP = 97
+    SELECT_IMAGES = 98
+    SELECT_IMAGES_HELP = 99
+    SELECT_IMAGES_UPLOAD = 100
+    SELECT_MODEL = 101
+    SELECT_MODEL_HELP = 102
+    SELECT_VIDEO = 103
+    SETTINGS_MANAGEMENT = 104
+    START_BATCH_PROCESSING = 105
+    STD_LENGTH = 106
+    SUCCESS_COUNT = 107
+    SUCCESSFUL_PROCESSING = 108
+    SWITCH_MODEL = 109
+    SYSTEM_CONFIG = 110
+    UNKNOWN_ERROR = 111
+    UPLOADED_COUNT = 112
+    VIDEO_UPLOAD = 113
+    VIDEO_UPLOAD_HELP = 114
+    VIDEO_UPLOADED = 115
+    VISUALIZATION = 116
+    CONFIG_APPLIED_MESSAGE = 117
+    CONFIG_DELETED_MESSAGE = 118
+    CONFIG_SAVED_MESSAGE = 119
+    DELETE_FAILED = 120
+    SAVE_FAILED = 121
+    CANNOT_DELETE_DEFAULT = 122
+    CLEAR_IMAGES = 123
+    START_IMAGE_BATCH_PROCESSING = 124
+    BATCH_PROCESSING_SUMMARY = 125
+    IMAGE_PROCESSING_COMPLETE = 126
+    CLEAR_IMAGE_RESULTS = 127
+    NO_IMAGE_RESULTS = 128
+    IMAGE_RESULTS_TITLE = 129
+    VIEW_STATS = 130
+    IMAGE_PROCESSING_FAILED_COUNT = 131
+    IMAGE_SUCCESS_RATIO = 132
+    DOWNLOAD_ZIP = 133
+    MAX_LENGTH = 134
+    MIN_LENGTH = 135
+    VIDEO_REFETCH = 136
+    START_VIDEO_PROCESSING = 137
+    VIDEO_INTERVAL_REQUIRED = 138
+    VIDEO_PROCESSING_START = 139
+    VIDEO_PROCESSING_COMPLETE = 140
+    CLEAR_VIDEO_RESULTS = 141
+    NO_VIDEO_RESULTS = 142
+    VIDEO_RESULTS_TITLE = 143
+    RESULTS_TAB_IMAGES = 144
+    RESULTS_TAB_VIDEOS = 145
+    DOWNLOAD_VIDEO = 146
+    FRAME_COUNT = 147
+    START_TIME = 148
+    END_TIME = 149
+    MAX_OCCURRENCE_TIME = 150
+    VIDEO_SEGMENT_LABEL = 151
+    VIDEO_INTERVALS_TITLE = 152
+    VIDEO_INTERVALS_HINT = 153
+    INTERVAL_START_LABEL = 154
+    INTERVAL_START_PLACEHOLDER = 155
+    INTERVAL_END_LABEL = 156
+    INTERVAL_END_PLACEHOLDER = 157
+    INTERVAL_ADD_BUTTON = 158
+    INTERVAL_END_AFTER_START = 159
+    INTERVAL_ADDED = 160
+    INTERVAL_PARSE_FAILED = 161
+    INTERVAL_LIST_TITLE = 162
+    INTERVAL_COLUMN_HEADER = 163
+    INTERVAL_COLUMN_HEADER_PAGED = 164
+    INTERVALS_EMPTY = 165
+    INTERVAL_MULTISELECT_LABEL = 166
+    DELETE_SELECTED_INTERVALS = 167
+    SELECT_INTERVALS_WARNING = 168
+    INTERVALS_DELETED = 169
+    MERGE_INTERVALS_BUTTON = 170
+    INTERVALS_MERGED = 171
+    CLEAR_INTERVALS = 172
+    INTERVAL_PAGE_LABEL = 173
+    INTERVAL_ERROR_INVALID_FORMAT = 174
+    INTERVAL_ERROR_INVALID_NUMBER = 175
+    INTERVAL_ERROR_EMPTY = 176
+    GOOGLE_IMG_DOWNLOAD_SUBTITLE = 177
+    GOOGLE_DRIVE_LINK_HINT_IMAGES = 178
+    GOOGLE_DRIVE_LINK_LABEL = 179
+    GOOGLE_IMG_DOWNLOAD_BUTTON = 180
+    GOOGLE_IMG_INFO = 181
+    GOOGLE_DRIVE_INVALID_LINK = 182
+    GOOGLE_IMG_CACHE_USED = 183
+    GOOGLE_FETCHING_DATA = 184
+    GOOGLE_IMG_DOWNLOAD_ERROR = 185
+    GOOGLE_IMG_DOWNLOAD_COMPLETE = 186
+    GOOGLE_IMG_COMPRESSING = 187
+    GOOGLE_IMG_COMPRESS_COMPLETE = 188
+    GOOGLE_VIDEO_DOWNLOAD_SUBTITLE = 189
+    GOOGLE_DRIVE_LINK_HINT_VIDEOS = 190
+    GOOGLE_VIDEO_DOWNLOAD_BUTTON = 191
+    GOOGLE_VIDEO_INFO = 192
+    GOOGLE_VIDEO_CACHED = 193
+    GOOGLE_VIDEO_DOWNLOAD_ERROR = 194
+    GOOGLE_VIDEO_NO_RESULTS = 195
+    GOOGLE_VIDEO_DOWNLOAD_COMPLETE = 196
+    GOOGLE_VIDEO_COMPRESSING = 197
+    GOOGLE_VIDEO_COMPRESS_COMPLETE = 198
+    GOOGLE_VIDEO_FETCH_FAILED = 199
+    GOOGLE_VIDEO_PATH_MISSING = 200
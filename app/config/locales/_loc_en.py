@@ -0,0 +1,204 @@
+# 由 scripts/local/build_locales.py 自動產生，請勿手動修改
+LABELS = (
+    '📊 Analysis Results',
+    '🚀 Apply Configuration',
+    'System Default',
+    '📋 Available Models Status',
+    'Average Length (mm)',
+    'Basic Parameters',
+    '🚀 System automatically performs batch inference for improved efficiency',
+    'Batch Processing',
+    '📦 Batch Size',
+    'batches',
+    'Clear Region',
+    '🗑️ Clear Results',
+    'Blue',
+    'Green',
+    'Red',
+    'White',
+    'Yellow',
+    'Configuration applied',
+    'Configuration deleted',
+    'Configuration Name',
+    'Enter a name for the current parameter configuration',
+    'Enter new configuration name...',
+    'Configuration saved',
+    'Confidence',
+    'Confidence Threshold',
+    'Minimum confidence threshold for YOLO detection',
+    '🎯 Current Model',
+    '🗑️ Delete Configuration',
+    'Display Length Labels',
+    'Show measurement values on the lines',
+    '📥 Download Complete Package (ZIP)',
+    'Contains all processed images, Excel and CSV files',
+    '📋 Download CSV File',
+    'Download measurement data in CSV format',
+    '📊 Download Excel Report',
+    'Download Excel report with statistical analysis',
+    '💾 Download Results',
+    '⬇️ Download image',
+    'Please enter configuration name',
+    '❌ Failed Images',
+    'File Size',
+    'Downward Search Distance (pixels)',
+    'Maximum pixel distance for downward vessel boundary search',
+    'Upward Search Distance (pixels)',
+    'Maximum pixel distance for upward vessel boundary search',
+    '📤 Image Upload',
+    'images',
+    '🎨 Interactive Region Selection',
+    'Drag on the image to select a rectangular region (only one region allowed)',
+    'Adjust selection area size',
+    'Width (px)',
+    'Height (px)',
+    'Current selection: {region}',
+    'Apply selection',
+    'Selection saved',
+    'Width Retention Ratio',
+    'Width retention ratio for boundary adjustment',
+    '🌐 Language',
+    'Line Transparency',
+    'Line transparency level, 1 is completely opaque',
+    'Line Color',
+    'Choose the color for measurement lines',
+    '🔍 Line Extraction Parameters',
+    'Line Thickness',
+    'Thickness of the drawn measurement lines',
+    '🔬 Vessel Segmentation & Measurement System',
+    'Maximum Average Length',
+    'Mean Length',
+    '📈 Measurement Data',
+    'Minimum Average Length',
+    '❌ Model Loading Failed',
+    'Model File',
+    '✅ Model Loaded Successfully',
+    '❌ No model loaded. Please select and load a model first',
+    '🤖 Model Selection',
+    'Model Status',
+    'Number of Lines',
+    '🔬',
+    'Vessel Segmentation & Measurement System',
+    '📷 Image Processing',
+    '🎞️ Video Processing',
+    '✅ Results & Downloads',
+    '🔖 Features',
+    'Pixel Size (mm/pixel)',
+    'Real-world distance represented by one pixel (in millimeters)',
+    '🚀 Process All Images',
+    'Processing completed',
+    '📊 Processing Efficiency',
+    'images failed to process',
+    'Range',
+    'Region Limitation',
+    'Enable region limitation to crop and analyze only the selected area',
+    'Sample Interval (pixels)',
+    'X-axis sampling step size. Smaller values create denser measurement lines',
+    '💾 Save Current Configuration',
+    'Save Current Configuration',
+    'Select Configuration',
+    'Choose a configuration preset to apply',
+    'Select Vessel Images',
+    'Supports PNG, JPG, JPEG, BMP, TIFF formats. Recommend max 200 images per batch',
+    'Select multiple images',
+    'Select Analysis Model',
+    'Choose the vessel segmentation model to use',
+    'Select Video File',
+    '💾 Settings Management',
+    'Starting batch processing',
+    'Standard Deviation',
+    'successful',
+    'Successfully Processed',
+    '🔄 Switch Model',
+    '⚙️ System Configuration',
+    'Unknown error',
+    'Uploaded',
+    '🎥 Video Upload 🚧 (Under Development)',
+    'Supports MP4, AVI, MOV video file formats',
+    'Video uploaded successfully',
+    '🎨 Visualization Parameters',
+    '✅ Configuration "{name}" applied',
+    '✅ Configuration "{name}" deleted',
+    '✅ Configuration "{name}" saved',
+    '❌ Failed to delete configuration',
+    '❌ Failed to save configuration',
+    '⚠️ Cannot delete the default configuration',
+    '🗑️ Clear images',
+    '📤 Start batch image processing',
+    'Processing {count} images across {batches} batches',
+    '✅ Image processing complete',
+    '🗑️ Clear image results',
+    'No image results yet',
+    '📷 Image Results',
+    '🔍 View statistics',
+    '⚠️ Failed to process {count} images',
+    '**Success: {success}/{total} images**',
+    'Download ZIP',
+    'Maximum Length',
+    'Minimum Length',
+    'Refetch video (if it does not appear)',
+    '📤 Start processing video',
+    'Please set time intervals first',
+    '🔍 Processing video... please wait',
+    '✅ Video processing complete',
+    '🗑️ Clear video results',
+    'No video results yet',
+    '🎞️ Video results overview',
+    '📷 Image Results',
+    '🎞️ Video Results',
+    '⬇️ Download video',
+    'Frame Count',
+    'Start Time',
+    'End Time',
+    'Max occurrence time (s)',
+    '▶️ Segment',
+    '### ⏱️ Set video processing intervals (seconds)',
+    'Examples: `75`, `75.5`, `01:15`, or `0:01:15`',
+    'Start (seconds or hh:mm:ss)',
+    'e.g. 75 or 00:01:15',
+    'End (seconds or hh:mm:ss)',
+    'e.g. 100 or 00:01:40',
+    '➕ Add interval',
+    'End time must be greater than the start time.',
+    'Added: {hms_start} → {hms_end} ({start:.2f}s → {end:.2f}s)',
+    'Failed to parse time: {error}',
+    '#### Added intervals',
+    'Intervals (click to select)',
+    'Intervals (page {page}/{pages})',
+    'No intervals yet. Enter values above and click "➕ Add interval".',
+    'Select intervals to delete (multi-select)',
+    '🗑️ Delete selected',
+    'Please select intervals to delete first.',
+    'Deleted {count} intervals.',
+    '🔀 Merge overlapping intervals',
+    'Merged overlapping or adjacent intervals.',
+    '🧹 Clear all intervals',
+    'Page',
+    'Invalid time format (use seconds or mm:ss or hh:mm:ss)',
+    'Interval contains invalid numbers',
+    'Empty string',
+    '🎞️ Download images from a Google Drive share link',
+    'Paste a Google Drive share link, e.g. https://drive.google.com/drive/folders/1ppSMdn1YYdc8rN56uKgWJhqezzneajAY?usp=drive_link',
+    'Drive share link or file id',
+    'Fetch images',
+    'Enter a Google Drive share link and click fetch images, e.g. https://drive.google.com/drive/folders/1ppSMdn1YYdc8rN56uKgWJhqezzneajAY?usp=drive_link',
+    'Please enter a valid Google Drive share link or file id.',
+    'Used cached link: {count} images',
+    'Fetching data...',
+    'Download error occurred: {error}',
+    'Download complete: {count} images',
+    'Compressing images...',
+    'Compression complete: {count} images',
+    '🎞️ Download video from a Google Drive share link',
+    'Paste a Google Drive share link, e.g. https://drive.google.com/file/d/1jmK_i5AvezX6fCAZLhTrxm0dUnI3KLQT/view?usp=drive_link',
+    'Fetch video',
+    'Enter a Google Drive share link and click fetch video, e.g. https://drive.google.com/file/d/1jmK_i5AvezX6fCAZLhTrxm0dUnI3KLQT/view?usp=drive_link',
+    'Used cached link: {name}',
+    'Download error occurred: {error}',
+    'No video files found or download failed. Check the link or permissions.',
+    'Download complete: {name}',
+    'Compressing video...',
+    'Compression complete: {name}',
+    'Download failed: {error}',
+    'Download failed: {name} missing',
+)
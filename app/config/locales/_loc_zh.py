@@ -0,0 +1,204 @@
+# 由 scripts/local/build_locales.py 自動產生，請勿手動修改
+LABELS = (
+    '📊 分析結果',
+    '🚀 套用設定',
+    '系統預設',
+    '📋 可用模型狀態',
+    '平均長度 (mm)',
+    '基本參數',
+    '🚀 系統會自動進行批次推理以提高效率',
+    '批次處理',
+    '📦 批次大小',
+    '批次',
+    '清除區域',
+    '🗑️ 清除結果',
+    '藍色',
+    '綠色',
+    '紅色',
+    '白色',
+    '黃色',
+    '已套用',
+    '已刪除',
+    '設定名稱',
+    '為當前的參數配置命名',
+    '輸入新設定的名稱...',
+    '已儲存',
+    '信心度',
+    '信心度閾值',
+    'YOLO 檢測的信心度閾值',
+    '🎯 當前模型',
+    '🗑️ 刪除設定',
+    '顯示長度標籤',
+    '是否在線條上顯示測量數值',
+    '📥 下載完整結果包 (ZIP)',
+    '包含所有處理後的圖片、Excel 和 CSV 檔案',
+    '📋 下載 CSV 檔案',
+    '下載測量數據的 CSV 格式檔案',
+    '📊 下載 Excel 報表',
+    '下載包含統計分析的 Excel 報表',
+    '💾 下載結果',
+    '⬇️ 下載該圖片',
+    '請輸入設定名稱',
+    '❌ 處理失敗的圖片',
+    '檔案大小',
+    '往下搜尋距離 (像素)',
+    '向下搜尋血管邊界的最大像素距離',
+    '往上搜尋距離 (像素)',
+    '向上搜尋血管邊界的最大像素距離',
+    '📤 圖片上傳',
+    '張圖片',
+    '🎨 互動式選擇區域',
+    '在圖片上拖拽滑鼠來選擇矩形區域（只能選擇一個區域）',
+    '調整選取區域尺寸',
+    '寬度 (px)',
+    '高度 (px)',
+    '目前選擇區域：{region}',
+    '套用選區',
+    '選區已儲存',
+    '保留寬度比例',
+    '用於邊界調整的寬度保留比例',
+    '🌐 語言',
+    '線條透明度',
+    '線條的透明度，1為完全不透明',
+    '線條顏色',
+    '選擇線條的顏色',
+    '🔍 線條提取參數',
+    '線條粗細',
+    '繪製線條的粗細程度',
+    '🔬 血管分割與測量系統',
+    '最大平均長度',
+    '平均長度',
+    '📈 測量數據',
+    '最小平均長度',
+    '❌ 模型載入失敗',
+    '模型檔案',
+    '✅ 模型已載入',
+    '❌ 模型尚未載入，請先選擇並載入模型',
+    '🤖 模型選擇',
+    '模型狀態',
+    '測量線數量',
+    '🔬',
+    '血管分割與測量系統',
+    '📷 圖片處理',
+    '🎞️ 影片處理',
+    '✅ 結果與下載',
+    '🔖 功能',
+    '像素大小 (mm/pixel)',
+    '一個像素對應的實際距離（毫米）',
+    '🚀 批次處理全部圖片',
+    '處理完成',
+    '📊 處理效率',
+    '張圖片處理失敗',
+    '範圍',
+    '區域限制',
+    '開啟區域限制，將圖片裁切到選擇的區域進行分析',
+    '採樣間隔 (像素)',
+    'x軸採樣步距，數值越小線條越密集',
+    '💾 儲存當前設定',
+    '儲存當前設定',
+    '選擇設定組合',
+    '選擇要套用的設定組合',
+    '選擇血管圖片',
+    '支援 PNG、JPG、JPEG、BMP、TIFF 格式，建議每批不超過 200 張圖片',
+    '選擇多張圖片',
+    '選擇分析模型',
+    '選擇要使用的血管分割模型',
+    '選擇影片檔案',
+    '💾 設定管理',
+    '開始批次處理',
+    '標準差',
+    '張成功',
+    '成功處理',
+    '🔄 切換模型',
+    '⚙️ 系統配置',
+    '未知錯誤',
+    '已上傳',
+    '🎥 影片上傳 🚧（功能開發中）',
+    '支援 MP4、AVI、MOV 格式的影片檔案',
+    '影片上傳成功',
+    '🎨 視覺化參數',
+    '✅ 設定「{name}」已套用',
+    '✅ 設定「{name}」已刪除',
+    '✅ 設定「{name}」已儲存',
+    '❌ 刪除設定失敗',
+    '❌ 儲存設定失敗',
+    '⚠️ 無法刪除預設設定',
+    '🗑️ 清空圖片',
+    '📤 開始批量處理圖片',
+    '共 {count} 張，分 {batches} 批處理',
+    '✅ 圖片處理完成',
+    '🗑️ 清空圖片結果',
+    '尚無圖片處理結果',
+    '📷 圖片處理結果',
+    '🔍 查看統計數據',
+    '⚠️ {count} 張處理失敗',
+    '**成功：{success}/{total} 張**',
+    '下載 ZIP',
+    '最大長度',
+    '最小長度',
+    '重新獲取影片 (假如未出現)',
+    '📤 開始處理影片',
+    '請先設定時間區間',
+    '🔍 開始處理影片 ... 請稍候',
+    '✅ 影片處理完成',
+    '🗑️ 清空影片結果',
+    '尚無影片處理結果',
+    '🎞️ 影片結果檢視',
+    '📷 圖片結果',
+    '🎞️ 影片結果',
+    '⬇️ 下載影片',
+    '幀數',
+    '開始時間',
+    '結束時間',
+    '最大出現秒數',
+    '▶️ 片段',
+    '### ⏱️ 設定影片處理區間（秒）',
+    '輸入範例：`75`、`75.5`、`01:15` 或 `0:01:15`',
+    '開始 (秒 或 hh:mm:ss)',
+    '例如 75 或 00:01:15',
+    '結束 (秒 或 hh:mm:ss)',
+    '例如 100 或 00:01:40',
+    '➕ 新增區間',
+    '結束時間必須大於開始時間。',
+    '已新增：{hms_start} → {hms_end} ({start:.2f}s → {end:.2f}s)',
+    '解析時間失敗：{error}',
+    '#### 已加入的區間',
+    '區間 (點選以選取)',
+    '區間 (第 {page}/{pages} 頁)',
+    '目前沒有任何區間。請在上方輸入並按「➕ 新增區間」。',
+    '選取要刪除的區間（可多選）',
+    '🗑️ 刪除所選',
+    '請先選擇要刪除的區間。',
+    '已刪除 {count} 筆。',
+    '🔀 合併重疊區間',
+    '已合併重疊 / 相接的區間。',
+    '🧹 清除全部區間',
+    '頁面',
+    '時間格式錯誤 (請使用秒數或 mm:ss 或 hh:mm:ss)',
+    '時間段包含非法數字',
+    '空字串',
+    '🎞️ 從 Google Drive 分享連結下載圖片',
+    '貼上 Google Drive 分享連結 範例 https://drive.google.com/drive/folders/1ppSMdn1YYdc8rN56uKgWJhqezzneajAY?usp=drive_link',
+    'Drive 分享連結 或 file id',
+    '獲取圖片',
+    '請輸入 Google Drive 分享連結然後按獲取圖片 範例 https://drive.google.com/drive/folders/1ppSMdn1YYdc8rN56uKgWJhqezzneajAY?usp=drive_link',
+    '請輸入有效的 Google Drive 分享連結或 file id。',
+    '已使用連結緩存 共 {count} 張圖片',
+    '獲取資料中...',
+    '下載過程發生錯誤：{error}',
+    '下載完成 共 {count} 張圖片',
+    '壓縮圖片中...',
+    '壓縮完成 共 {count} 張圖片',
+    '🎞️ 從 Google Drive 分享連結下載影片',
+    '貼上 Google Drive 分享連結 範例 https://drive.google.com/file/d/1jmK_i5AvezX6fCAZLhTrxm0dUnI3KLQT/view?usp=drive_link',
+    '獲取影片',
+    '請輸入 Google Drive 分享連結然後按獲取影片 範例 https://drive.google.com/file/d/1jmK_i5AvezX6fCAZLhTrxm0dUnI3KLQT/view?usp=drive_link',
+    '已使用連結緩存：{name}',
+    '下載過程發生錯誤：{error}',
+    '未找到任何關於影片的檔案或下載失敗，請確認連結或權限設定。',
+    '下載完成：{name}',
+    '壓縮影片中...',
+    '壓縮完成：{name}',
+    '下載失敗：{error}',
+    '下載失敗：{name} 不存在',
+)
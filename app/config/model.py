@@ -1,7 +1,18 @@
 import streamlit as st
+import torch
+from utils.line_extractor import warmup_kernel
 from utils.yolo_predictor import YOLOPredictor
 
-from .config import AVAILABLE_MODELS, DEFAULT_MODEL, MODELS_DIR
+from .config import (
+    AVAILABLE_MODELS,
+    DEFAULT_MODEL,
+    MODELS_DIR,
+    TARGET_SIZE,
+    TENSORRT_ENGINE,
+    TORCH_COMPILE,
+    TORCH_COMPILE_MODE,
+    YOLO_CONFIG,
+)
 
 def get_model_path(model_name):
     """根據模型名稱獲取完整路徑"""
@@ -9,38 +20,61 @@ def get_model_path(model_name):
         return MODELS_DIR / AVAILABLE_MODELS[model_name]
     return MODELS_DIR / AVAILABLE_MODELS[DEFAULT_MODEL]
 
-@st.cache_resource
+# 只保留一個模型：每個模型都預跑、channels_last 並編譯過，同時常駐多個會佔滿顯存
+# （切換後舊模型仍被其他 session 的 session_state 引用時，等它們也切換後才會釋放）
+@st.cache_resource(max_entries=1)
 def load_model(model_name):
-    """載入並快取 YOLO 模型"""
-    try:
-        weights_path = get_model_path(model_name)
-        if not weights_path.exists():
-            st.error(f"模型檔案不存在: {weights_path}")
-            return None, None
-        predictor = YOLOPredictor(weights_path)
-        print("成功載入模型", weights_path)
-        return predictor, model_name
-    except Exception as e:
-        st.error(f"模型載入失敗: {str(e)}")
-        return None, None
+    """
+    載入並快取 YOLO 模型。
+    失敗時直接拋出例外（由 switch_model 顯示錯誤）：cache_resource 不快取例外，暫時性錯誤（例如 CUDA OOM）下次切換即可重試
+    """
+    weights_path = get_model_path(model_name)
+    if not weights_path.exists():
+        raise FileNotFoundError(f"模型檔案不存在: {weights_path}")
+    if TENSORRT_ENGINE:
+        # 匯出失敗時沿用原本的 .pt 權重
+        weights_path = YOLOPredictor.export_tensorrt(
+            weights_path, YOLO_CONFIG["imgsz"], YOLO_CONFIG["batch"]
+        ) or weights_path
+    # 推論輸入尺寸固定（letterbox 到 TARGET_SIZE、批次 BATCH_SIZE），讓 cuDNN 為此尺寸挑選最快的卷積演算法；
+    # 挑選發生在下方預跑時
+    torch.backends.cudnn.benchmark = True
+    predictor = YOLOPredictor(weights_path)
+    # 以與實際推論相同的設定（FP16）預跑，避免首次請求承擔冷啟動成本
+    predictor.warmup(TARGET_SIZE, **YOLO_CONFIG)
+    # 預跑後 predictor 已建立（含 fuse）：權重改為 channels_last，讓 FP16 卷積走 NHWC 的 Tensor Core 路徑
+    channels_last = predictor.to_channels_last()
+    # 再編譯並預跑（在 compile 內）讓編譯成本落在載入階段，編譯失敗時退回 eager；
+    # reduce-overhead 需跑過暖機、錄製、重播三次才會進入 CUDA Graph 重播
+    compiled = TORCH_COMPILE and predictor.compile(
+        TARGET_SIZE,
+        mode=TORCH_COMPILE_MODE,
+        runs=3 if TORCH_COMPILE_MODE == "reduce-overhead" else 1,
+        **YOLO_CONFIG,
+    )
+    if not compiled and channels_last:
+        # 記憶體格式改變後 cuDNN 會重新挑選演算法，同樣在載入階段預跑一次
+        predictor.warmup(TARGET_SIZE, runs=1, **YOLO_CONFIG)
+    # 直線提取的 numba 核心也在載入階段編譯（或讀取磁碟快取），不讓第一個圖片請求承擔 JIT 成本
+    warmup_kernel()
+    print("成功載入模型", weights_path)
+    return predictor, model_name
 
-@st.cache_resource
 def switch_model(new_model_name) -> bool:
     """切換模型"""
     if new_model_name != st.session_state.get('current_model_name'):
-        # 清除快取並重新載入模型
-        load_model.clear()
+        # load_model 以模型名稱為 key 跨 session 共用：不清除快取，選同一個模型的新 session 直接沿用
         with st.spinner(f"正在載入模型: {new_model_name}..."):
-            predictor, loaded_model_name = load_model(new_model_name)
-            if predictor is not None:
-                st.session_state.predictor = predictor
-                st.session_state.current_model_name = loaded_model_name
-                st.session_state.selected_model = new_model_name
-                # 清除之前的處理結果
-                st.session_state.processed_results = []
-                st.success(f"✅ 已切換至模型: {new_model_name}")
-                st.rerun()
-            else:
-                st.error(f"❌ 模型載入失敗: {new_model_name}")
+            try:
+                predictor, loaded_model_name = load_model(new_model_name)
+            except Exception as e:
+                st.error(f"❌ 模型載入失敗: {new_model_name}（{e}）")
                 return False
+            st.session_state.predictor = predictor
+            st.session_state.current_model_name = loaded_model_name
+            st.session_state.selected_model = new_model_name
+            # 清除之前的處理結果
+            st.session_state.processed_results = []
+            st.success(f"✅ 已切換至模型: {new_model_name}")
+            st.rerun()
     return True
\ No newline at end of file
@@ -6,6 +6,8 @@ from config import (
     PAGES,
     # language
     get_text,
+    preload_languages,
+    LANGUAGE_CODES,
 )
 from ui import (
     model_section, 
@@ -40,6 +42,9 @@ def init_session():
     # 默認語言
     if 'language' not in st.session_state:
         st.session_state.language = 'zh'
+        # 新 session：背景載入其他語言，切換語言時不必等待讀檔（已載入的語言不會再啟動執行緒）
+        current = st.session_state.language
+        preload_languages(*(lang for lang in LANGUAGE_CODES if lang != current))
     # 初始化 file_storage_manager
     if 'file_manager_initialized' not in st.session_state:
         file_storage_manager.initialize_session_state()
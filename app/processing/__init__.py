@@ -1,9 +1,19 @@
-from .process_img import process_batch_images
+from .process_img import (
+  extract_batch_lines,
+  infer_batch_lines,
+  infer_batch_masks,
+  process_batch_images,
+  render_line_results,
+)
 from .process_video import process_video
 from .video_Interval_processor import IntervalStat, VideoIntervalProcessor
 
 __all__ = [
+  "extract_batch_lines",
+  "infer_batch_lines",
+  "infer_batch_masks",
   "process_batch_images",
+  "render_line_results",
   "process_video",
   "IntervalStat",
   "VideoIntervalProcessor"
@@ -1,7 +1,7 @@
 import numpy as np
-from typing import List, Tuple, Union, Optional, Dict, Any
+from typing import TYPE_CHECKING, Iterable, List, Tuple, Union, Optional, Dict, Any
 from PIL import Image
-import math
+from itertools import islice
 
 from utils.image import batch_uniform_resize_cuda
 from utils.canvas import convert_original_xywh_to_resized
@@ -14,133 +14,238 @@ from config import (
 )
 from utils.line_extractor import LineExtractor
 from utils.visualizer import Visualizer
-from utils.yolo_predictor import YOLOPredictor
 
-def process_batch_images(
-    predictor: YOLOPredictor,
-    images: List[Tuple[str, Image.Image]],
-    pixel_size_mm: float = 0.30,
+if TYPE_CHECKING:
+    # 僅供型別標註，執行時不匯入（避免一載入本模組就初始化 ultralytics）
+    import torch
+    from utils.yolo_predictor import YOLOPredictor
+
+def _to_rgb_array(image: Union[Image.Image, np.ndarray, "torch.Tensor"]) -> Union[np.ndarray, "torch.Tensor"]:
+    """PIL 圖片轉為 RGB ndarray；已解碼的 ndarray 或 GPU tensor (H,W,C) 直接回傳"""
+    if not isinstance(image, Image.Image):
+        return image
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return np.array(image)
+
+def _line_lengths_mm(lines: List[Tuple[int, int, int]], pixel_size_mm: float) -> np.ndarray:
+    """[(x, y1, y2), ...] 一次轉成陣列，向量化計算每條線長度 (mm)"""
+    arr = np.asarray(lines, dtype=np.float64).reshape(-1, 3)
+    return np.abs(arr[:, 2] - arr[:, 1]) * pixel_size_mm
+
+def infer_batch_masks(
+    predictor: 'YOLOPredictor',
+    images: Iterable[Tuple[str, Union[Image.Image, np.ndarray]]],
     conf_threshold: float = 0.25,
-    # (x, y, w, h)
-    region: Optional[Tuple[int, int, int, int]] = None,
-    line_config: Union[dict, None] = None,
-    vis_config: Union[dict, None] = None):
-    """批次處理多張圖片"""
-    if line_config is None:
-        line_config = LINE_CONFIG.copy()
-    if vis_config is None:
-        vis_config = VISUALIZATION_CONFIG.copy()
-     
-    extractor = LineExtractor()
-    visualizer = Visualizer()
-    
-    results = []
-    
+    batch_size: int = BATCH_SIZE) -> List[Dict[str, Any]]:
+    """
+    批次縮放並以 YOLO 推論分割遮罩（結果只受模型、圖片與信心門檻影響）。
+    images 可為惰性 iterator（例如執行緒池解碼的結果），每湊滿一批就送進 GPU，後面的圖片同時繼續解碼；
+    圖片可為 PIL、RGB ndarray 或已在 GPU 上的 (H,W,C) uint8 tensor。
+
+    Returns:
+        每張圖片一個 dict：含 orig_size (w, h)；成功時另含 resized_image / confidence / mask，失敗時含 error
+    """
     # 獲取 yolo 配置 並覆蓋 conf 參數
     yolo_config = YOLO_CONFIG.copy()
     yolo_config['conf'] = conf_threshold
-    
-    results: List[Dict[str, Any]] = []
-    
-    n = len(images)
-    total_batches = math.ceil(n / BATCH_SIZE)
-    
+    yolo_config['batch'] = batch_size
 
-    # 如果提供了 region（原始座標系），先轉到 resized 座標系
-    if region is not None:
-        # 假設所有圖都一樣大小，取第一張原始尺寸
-        orig_w, orig_h = images[0][1].size
-        region = convert_original_xywh_to_resized(region, (orig_w, orig_h), TARGET_SIZE)
+    inferred: List[Dict[str, Any]] = []
 
     # 分批處理
-    for batch_idx in range(total_batches):
-        start = batch_idx * BATCH_SIZE
-        batch = images[start : start + BATCH_SIZE]
+    it = iter(images)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            break
 
-        # 轉 PIL -> np.ndarray
-        batch_arrays = [np.array(pil.convert("RGB")) for _, pil in batch]
+        # 轉 PIL -> np.ndarray（已是 ndarray / GPU tensor 則不再轉換）
+        batch_arrays = [_to_rgb_array(img) for _, img in batch]
 
         # 等比縮放 + 黑邊填充 (僅在記憶體中)
         resized_results = batch_uniform_resize_cuda(
             batch_arrays,
             target_size=TARGET_SIZE,
-            
+
         )
         resized_images = [r.resized_image for r in resized_results]
 
-        # YOLO 預測
-        yolo_outputs = predictor.predict(resized_images, **yolo_config)
+        # YOLO 預測（結果留在 GPU），整批的最高信心遮罩在 GPU 上二值化後一次搬回
+        yolo_outputs = predictor.predict(resized_images, to_cpu=False, **yolo_config)
+        picked = predictor.extract_max_confidence_masks(yolo_outputs)
 
-        # 逐張分析
         for idx_in_batch, (filename, _) in enumerate(batch):
+            orig_h, orig_w = batch_arrays[idx_in_batch].shape[:2]
             # 若 YOLO 回傳少於預期，補上 None
             yolo_out = yolo_outputs[idx_in_batch] if idx_in_batch < len(yolo_outputs) else None
 
             if yolo_out is None:
-                results.append({
-                    'filename': filename,
-                    'result': None,
-                    'stats': {'error': '預測失敗'},
-                    'success': False
-                })
+                inferred.append({'filename': filename, 'orig_size': (orig_w, orig_h), 'success': False, 'error': '預測失敗'})
                 continue
 
-            # 取最高信心的分割 mask
-            _, confidence, mask = predictor.extract_max_confidence_segment(yolo_out)
+            # 最高信心的分割 mask
+            confidence, mask = picked[idx_in_batch]
             if mask is None:
-                results.append({
-                    'filename': filename,
-                    'result': None,
-                    'stats': {'error': '未檢測到分割遮罩'},
-                    'success': False
-                })
+                inferred.append({'filename': filename, 'orig_size': (orig_w, orig_h), 'success': False, 'error': '未檢測到分割遮罩'})
                 continue
 
-            # 在 resized 圖上提取直線
-            resized_img = resized_images[idx_in_batch]
-            verticals = extractor.extract_vertical_lines_from_mask(
-                img=resized_img,
-                mask=mask,
-                region=region,
-                sample_interval=line_config['sample_interval'],
-                gradient_search_top=line_config['gradient_search_top'],
-                gradient_search_bottom=line_config['gradient_search_bottom'],
-                keep_ratio=(None if region else line_config['keep_ratio'])
-            )
-
-            # 視覺化直線
-            vis_img = visualizer.visualize_vertical_lines_with_mm(
-                resized_img,
-                verticals,
-                pixel_size_mm=pixel_size_mm,
-                line_color=vis_config['line_color'],
-                line_thickness=vis_config['line_thickness'],
-                line_alpha=vis_config['line_alpha'],
-                display_labels=vis_config['display_labels']
-            )
-
-            # 計算長度統計 (mm)
-            lengths = [abs(y2 - y1) * pixel_size_mm for _, y1, y2 in verticals]
-            stats = {
-                'confidence': float(confidence),
-                'num_lines': len(verticals),
-                'mean_length': float(np.mean(lengths)) if lengths else 0.0,
-                'std_length':   float(np.std(lengths)) if lengths else 0.0,
-                'max_length':   float(np.max(lengths)) if lengths else 0.0,
-                'min_length':   float(np.min(lengths)) if lengths else 0.0,
-            }
-
-            # 轉回 PIL Image
-            vis_img = Image.fromarray(vis_img)
-            
-            results.append({
+            inferred.append({
                 'filename': filename,
-                'result': vis_img,
-                'stats': stats,
-                'success': True
+                'orig_size': (orig_w, orig_h),
+                'success': True,
+                'resized_image': resized_images[idx_in_batch],
+                'confidence': confidence,
+                'mask': mask,
             })
-    
+
     # 釋放 GPU 快取
     predictor.clear_cache()
 
-    return results
\ No newline at end of file
+    return inferred
+
+def extract_batch_lines(
+    masks: List[Dict[str, Any]],
+    # (x, y, w, h)
+    region: Optional[Tuple[int, int, int, int]] = None,
+    line_config: Union[dict, None] = None) -> List[Dict[str, Any]]:
+    """
+    在 infer_batch_masks 的遮罩上提取直線（不需 GPU，只受直線提取參數與 region 影響）
+
+    Returns:
+        每張圖片一個 dict：成功時含 resized_image / confidence / verticals，失敗時含 error
+    """
+    if line_config is None:
+        line_config = LINE_CONFIG.copy()
+
+    extractor = LineExtractor()
+
+    # 如果提供了 region（原始座標系），先轉到 resized 座標系
+    if region is not None and masks:
+        # 假設所有圖都一樣大小，取第一張原始尺寸
+        region = convert_original_xywh_to_resized(region, masks[0]['orig_size'], TARGET_SIZE)
+
+    results: List[Dict[str, Any]] = []
+    for item in masks:
+        if not item['success']:
+            results.append({'filename': item['filename'], 'success': False, 'error': item['error']})
+            continue
+
+        # 在 resized 圖上提取直線
+        resized_img = item['resized_image']
+        verticals = extractor.extract_vertical_lines_from_mask(
+            img=resized_img,
+            mask=item['mask'],
+            region=region,
+            sample_interval=line_config['sample_interval'],
+            gradient_search_top=line_config['gradient_search_top'],
+            gradient_search_bottom=line_config['gradient_search_bottom'],
+            keep_ratio=(None if region else line_config['keep_ratio'])
+        )
+
+        results.append({
+            'filename': item['filename'],
+            'success': True,
+            'resized_image': resized_img,
+            'confidence': item['confidence'],
+            'verticals': verticals,
+        })
+
+    return results
+
+def infer_batch_lines(
+    predictor: 'YOLOPredictor',
+    images: List[Tuple[str, Union[Image.Image, np.ndarray]]],
+    conf_threshold: float = 0.25,
+    # (x, y, w, h)
+    region: Optional[Tuple[int, int, int, int]] = None,
+    line_config: Union[dict, None] = None,
+    batch_size: int = BATCH_SIZE) -> List[Dict[str, Any]]:
+    """
+    批次推論並提取直線（不含視覺化，結果只受推論相關參數影響）
+
+    Returns:
+        每張圖片一個 dict：成功時含 resized_image / confidence / verticals，失敗時含 error
+    """
+    masks = infer_batch_masks(predictor, images, conf_threshold=conf_threshold, batch_size=batch_size)
+    return extract_batch_lines(masks, region=region, line_config=line_config)
+
+def render_line_results(
+    inferred: List[Dict[str, Any]],
+    pixel_size_mm: float = 0.30,
+    vis_config: Union[dict, None] = None) -> List[Dict[str, Any]]:
+    """將 infer_batch_lines 的結果視覺化並計算長度統計（只受顯示相關參數影響）"""
+    if vis_config is None:
+        vis_config = VISUALIZATION_CONFIG.copy()
+
+    visualizer = Visualizer()
+    results: List[Dict[str, Any]] = []
+
+    for item in inferred:
+        filename = item['filename']
+        if not item['success']:
+            results.append({
+                'filename': filename,
+                'result': None,
+                'stats': {'error': item['error']},
+                'success': False
+            })
+            continue
+
+        verticals = item['verticals']
+
+        # 視覺化直線
+        vis_img = visualizer.visualize_vertical_lines_with_mm(
+            item['resized_image'],
+            verticals,
+            pixel_size_mm=pixel_size_mm,
+            line_color=vis_config['line_color'],
+            line_thickness=vis_config['line_thickness'],
+            line_alpha=vis_config['line_alpha'],
+            display_labels=vis_config['display_labels']
+        )
+
+        # 計算長度統計 (mm)
+        lengths = _line_lengths_mm(verticals, pixel_size_mm)
+        has_lines = lengths.size > 0
+        stats = {
+            'confidence': item['confidence'],
+            'num_lines': len(verticals),
+            'mean_length': float(lengths.mean()) if has_lines else 0.0,
+            'std_length':   float(lengths.std()) if has_lines else 0.0,
+            'max_length':   float(lengths.max()) if has_lines else 0.0,
+            'min_length':   float(lengths.min()) if has_lines else 0.0,
+        }
+
+        # 轉回 PIL Image
+        vis_img = Image.fromarray(vis_img)
+
+        results.append({
+            'filename': filename,
+            'result': vis_img,
+            'stats': stats,
+            'success': True
+        })
+
+    return results
+
+def process_batch_images(
+    predictor: 'YOLOPredictor',
+    images: List[Tuple[str, Union[Image.Image, np.ndarray]]],
+    pixel_size_mm: float = 0.30,
+    conf_threshold: float = 0.25,
+    # (x, y, w, h)
+    region: Optional[Tuple[int, int, int, int]] = None,
+    line_config: Union[dict, None] = None,
+    vis_config: Union[dict, None] = None,
+    batch_size: int = BATCH_SIZE):
+    """批次處理多張圖片（images 可為 PIL 圖片或已解碼的 RGB ndarray）"""
+    inferred = infer_batch_lines(
+        predictor,
+        images,
+        conf_threshold=conf_threshold,
+        region=region,
+        line_config=line_config,
+        batch_size=batch_size,
+    )
+    return render_line_results(inferred, pixel_size_mm=pixel_size_mm, vis_config=vis_config)
@@ -1,4 +1,4 @@
-from typing import Tuple, Union, Optional, Dict, List
+from typing import TYPE_CHECKING, Tuple, Union, Optional, Dict, List
 from pathlib import Path
 
 from utils.stability_filter import StabilityConfig
@@ -12,10 +12,12 @@ from config import (
 from .video_Interval_processor import VideoIntervalProcessor, IntervalStat
 from utils.line_extractor import LineExtractor
 from utils.visualizer import Visualizer
-from utils.yolo_predictor import YOLOPredictor
+
+if TYPE_CHECKING:
+    from utils.yolo_predictor import YOLOPredictor
 
 def process_video(
-    predictor: YOLOPredictor,
+    predictor: 'YOLOPredictor',
     video_path: Path,
     pixel_size_mm: float = 0.30,
     conf_threshold: float = 0.25,
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple, Dict, Optional
+from typing import TYPE_CHECKING, List, Tuple, Dict, Optional
 import math
 
 import cv2
@@ -20,7 +20,9 @@ from utils.ffmpeg_pipe import FFmpegPipe
 from utils.image import batch_uniform_resize_cuda
 from utils.stability_filter import SlidingStabilityFilter, StabilityConfig
 from utils.visualizer import Visualizer
-from utils.yolo_predictor import YOLOPredictor
+
+if TYPE_CHECKING:
+    from utils.yolo_predictor import YOLOPredictor
 
 @dataclass
 class IntervalStat:
@@ -38,8 +40,8 @@ def mm_mean_from_lines(lines, pixel_size_mm: float) -> float:
     """計算該幀所有垂直線長度（mm）的平均。"""
     if not lines:
         return 0.0
-    lengths_px = [abs(y2 - y1) for _, y1, y2 in lines]
-    return float(np.mean(lengths_px) * pixel_size_mm)
+    arr = np.asarray(lines, dtype=np.float64).reshape(-1, 3)
+    return float(np.abs(arr[:, 2] - arr[:, 1]).mean() * pixel_size_mm)
 
 
 class VideoIntervalProcessor:
@@ -48,7 +50,7 @@ class VideoIntervalProcessor:
     def __init__(
         self,
         *,
-        predictor: YOLOPredictor,
+        predictor: 'YOLOPredictor',
         line_extractor: LineExtractor,
         visualizer: Visualizer,
         stability_filter_config: Optional[StabilityConfig] = None,
@@ -96,7 +98,7 @@ class VideoIntervalProcessor:
     def _frame_postprocess(
         self,
         frame: np.ndarray,
-        result,
+        mask: Optional[np.ndarray],
         region_resized: Optional[Tuple[int, int, int, int]] = None,
         stab: Optional[SlidingStabilityFilter] = None,
     ) -> Tuple[Optional[float], np.ndarray]:
@@ -108,8 +110,7 @@ class VideoIntervalProcessor:
             mean_mm: 該幀所有垂直線長度（mm）的平均；偵測不到時為 None
             frame_out: 可視化後影格（或原影格）
         """
-        # 從 YOLO 結果中擷取「最高信心」的分割遮罩；假設遮罩與 frame 尺寸對齊
-        _, _, mask = self.predictor.extract_max_confidence_segment(result)
+        # mask 為該幀「最高信心」的分割遮罩（由 flush_batch 整批取出）；假設遮罩與 frame 尺寸對齊
         if mask is None:
             return None, frame
 
@@ -252,13 +253,14 @@ class VideoIntervalProcessor:
                 )
 
                 resized_frames = [r.resized_image for r in resized_results]
-                predict_results = self.predictor.predict(resized_frames, **self.yolo_config)
+                predict_results = self.predictor.predict(resized_frames, to_cpu=False, **self.yolo_config)
+                picked = self.predictor.extract_max_confidence_masks(predict_results)
 
                 # 逐幀後處理與寫出（frame 是 resize 後的）
-                for frm_resized, res, idx in zip(resized_frames, predict_results, batch_indices):
+                for frm_resized, (_, mask), idx in zip(resized_frames, picked, batch_indices):
                     mean_mm, frame_out = self._frame_postprocess(
                         frm_resized,
-                        res,
+                        mask,
                         region_resized,
                         stab,
                     )
@@ -303,8 +305,9 @@ class VideoIntervalProcessor:
             # 區間統計
             if frame_means:
                 means_only = [m for _, m in frame_means]
-                mean_of_means = float(np.mean(means_only))
-                max_pos = int(np.argmax(means_only))
+                # 純 Python 純量統計即可，不必先轉成 ndarray
+                mean_of_means = sum(means_only) / len(means_only)
+                max_pos = max(range(len(means_only)), key=means_only.__getitem__)
                 max_of_means = float(means_only[max_pos])
                 max_at_frame = frame_means[max_pos][0]
                 max_at_s = float(max_at_frame / src_fps)
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional, List
 from pathlib import Path
 import streamlit as st
@@ -18,12 +19,17 @@ MAX_COMPRESS_SIZE = 1024 * 1024 * 2
 UPDATE_DIR = Path(TEMP_DIR) / "uploaded_images"
 UPDATE_DIR.mkdir(parents=True, exist_ok=True)
 
-# 初始化 DriveFetcher
-fetcher = DriveFetcher(
-    service_account_file=SA_FILE,
-    allowed_extensions=['.jpg', '.jpeg', '.png'],
-    max_workers=8,
-)
+# DriveFetcher 延遲到第一次下載時才建立（建立時會初始化 Google API 服務）
+@lru_cache(maxsize=1)
+def _get_fetcher() -> DriveFetcher:
+    """
+    取得共用的 DriveFetcher
+    """
+    return DriveFetcher(
+        service_account_file=SA_FILE,
+        allowed_extensions=['.jpg', '.jpeg', '.png'],
+        max_workers=8,
+    )
 
 def _is_drive_link(url: str) -> bool:
     """
@@ -101,7 +107,7 @@ def google_img_update() -> Optional[List[Path]]:
     try:
         with st.spinner(get_text('google_fetching_data')):
             all_exists = True
-            results = fetcher.fetch(link, download_dir=UPDATE_DIR, recurse=False, only_list=True, preserve_structure=False)
+            results = _get_fetcher().fetch(link, download_dir=UPDATE_DIR, recurse=False, only_list=True, preserve_structure=False)
             # 假如有獲取結果檢查是否有快取
             if results and IMAGE_COMPRESSOR:
                 # 壓縮圖片
@@ -121,7 +127,7 @@ def google_img_update() -> Optional[List[Path]]:
                 _set_cache(link, results)
                 return [Path(r.path) for r in results]
             
-            results = fetcher.fetch(link, download_dir=UPDATE_DIR, recurse=False, preserve_structure=False)
+            results = _get_fetcher().fetch(link, download_dir=UPDATE_DIR, recurse=False, preserve_structure=False)
     except Exception as e:
         st.error(get_text('google_img_download_error').format(error=e))
         return None
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional
 from pathlib import Path
 import streamlit as st
@@ -18,12 +19,17 @@ MAX_COMPRESS_SIZE = 1024 * 1024 * 150
 UPDATE_DIR = Path(TEMP_DIR) / "uploaded_videos"
 UPDATE_DIR.mkdir(parents=True, exist_ok=True)
 
-# 初始化 DriveFetcher
-fetcher = DriveFetcher(
-    service_account_file=SA_FILE,
-    allowed_extensions=['.mp4', '.mov', '.mkv', '.webm', '.avi', '.flv'],
-    max_workers=1,
-)
+# DriveFetcher 延遲到第一次下載時才建立（建立時會初始化 Google API 服務）
+@lru_cache(maxsize=1)
+def _get_fetcher() -> DriveFetcher:
+    """
+    取得共用的 DriveFetcher
+    """
+    return DriveFetcher(
+        service_account_file=SA_FILE,
+        allowed_extensions=['.mp4', '.mov', '.mkv', '.webm', '.avi', '.flv'],
+        max_workers=1,
+    )
 compressor = VideoCompressor()
 
 def _is_drive_link(url: str) -> bool:
@@ -88,7 +94,7 @@ def google_video_update() -> Optional[Path]:
     # 下載新影片
     try:
         with st.spinner(get_text('google_fetching_data')):
-            results = fetcher.fetch(link, download_dir=UPDATE_DIR, recurse=False, only_list=True)
+            results = _get_fetcher().fetch(link, download_dir=UPDATE_DIR, recurse=False, only_list=True)
             # 假如有獲取結果檢查是否有快取
             if results and VIDEO_COMPRESSOR:
                 com_path = _get_compressed_path(results[0].path)
@@ -101,7 +107,7 @@ def google_video_update() -> Optional[Path]:
                 if results[0].path.exists():
                     _set_cache(link, results[0])
                     return results[0].path
-            results = fetcher.fetch(link, download_dir=UPDATE_DIR, recurse=False)
+            results = _get_fetcher().fetch(link, download_dir=UPDATE_DIR, recurse=False)
     except Exception as e:
         st.error(get_text('google_video_download_error').format(error=e))
         return None
@@ -1,8 +1,15 @@
+import concurrent.futures
+import hashlib
 import math
+import os
+import threading
 import zipfile
+from collections import OrderedDict, defaultdict
 from io import BytesIO
-from typing import List, Dict, Any
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
 
+import numpy as np
 import streamlit as st
 from PIL import Image
 from streamlit.runtime.uploaded_file_manager import UploadedFile
@@ -17,8 +24,9 @@ from config import (
 )
 from ui import canvas
 from utils.excel import generate_excel_img_results
-from processing import process_batch_images
+from processing import extract_batch_lines, infer_batch_masks, render_line_results
 from utils.canvas import FileLike
+from utils.image import batch_decode_jpeg_cuda, batch_encode_jpeg_cuda
 
 def _serialize_uploaded_files(files: List[UploadedFile]) -> List[Dict[str, Any]]:
     """將 Streamlit 的 UploadedFile 物件轉換成可放入 session 的一般資料結構。"""
@@ -58,6 +66,191 @@ def _image_to_bytes(image: Image.Image, fmt: str = "JPEG") -> BytesIO:
     buffer.seek(0)
     return buffer
 
+def _encode_images(images: List[Image.Image], fmt: str = "JPEG") -> List[bytes]:
+    """
+    編碼多張圖片，回傳順序與輸入相同。
+    JPEG 優先以 GPU（nvJPEG）批次編碼；不可用時以多執行緒平行編碼（Pillow 編碼時會釋放 GIL）。
+    """
+    if fmt == "JPEG" and len(images) > 1:
+        # Pillow 的 JPEG 預設品質即為 75
+        encoded = batch_encode_jpeg_cuda([np.asarray(img) for img in images], quality=75)
+        if encoded is not None:
+            return encoded
+    if len(images) <= 1:
+        return [_image_to_bytes(img, fmt).getvalue() for img in images]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        return list(ex.map(lambda img: _image_to_bytes(img, fmt).getvalue(), images))
+
+# 下載內容（單張 JPEG / ZIP / Excel）的 session 快取
+_DOWNLOAD_CACHE_KEY = "img_download_cache"
+
+def _download_payload(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    結果更新後第一次重繪時才編碼，之後的重繪直接沿用（以 img_results 串列本身識別）；
+    結果頁與下載區共用同一份 JPEG，不再每次重繪各自重新編碼。
+    """
+    cached = st.session_state.get(_DOWNLOAD_CACHE_KEY)
+    if cached is not None and cached[0] is results:
+        return cached[1]
+
+    imgs = [r for r in results if r['success']]
+    # Excel 與 JPEG 編碼互不相依：Excel 在背景執行緒產生，同時編碼圖片（xlsxwriter 寫入 zip 時 zlib 會釋放 GIL）
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
+        excel_future = ex.submit(generate_excel_img_results, results)
+        encoded = _encode_images([r['result'] for r in imgs])
+        buf_xl = excel_future.result()
+    buf_zip = BytesIO()
+    # JPEG 與 xlsx 本身已壓縮，以 ZIP_STORED 直接存放，省去無效的 deflate
+    with zipfile.ZipFile(buf_zip, 'w', compression=zipfile.ZIP_STORED) as zf:
+        names = _dedup_names([r['filename'] for r in imgs])
+        for name, data in zip(names, encoded):
+            zf.writestr(f"images/{name}.jpg", data)
+        zf.writestr("image_results.xlsx", buf_xl.getvalue())
+
+    payload = {'images': encoded, 'zip': buf_zip.getvalue(), 'excel': buf_xl.getvalue()}
+    st.session_state[_DOWNLOAD_CACHE_KEY] = (results, payload)
+    return payload
+
+def _dedup_names(names: List[str]) -> List[str]:
+    """同名檔案依出現順序加上 _1、_2… 後綴（加在副檔名前），避免 ZIP 內檔名重複"""
+    seen: Dict[str, int] = defaultdict(int)
+    splits = [os.path.splitext(n) for n in names]
+    out: List[str] = []
+    for name, (stem, ext) in zip(names, splits):
+        seen[name] += 1
+        count = seen[name]
+        out.append(name if count == 1 else f"{stem}_{count - 1}{ext}")
+    return out
+
+def _load_rgb_array(file: FileLike) -> np.ndarray:
+    """直接從記憶體中的上傳內容（或本地路徑）解碼為 RGB ndarray，不經過暫存檔"""
+    with Image.open(file) as img:
+        # 已是 RGB（多數 JPEG）時不再 convert，省去一次整張影像的複製
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        return np.array(img)
+
+def _file_bytes(file: FileLike) -> bytes:
+    """取得上傳檔案（BytesIO）或本地路徑的原始內容"""
+    if isinstance(file, (str, Path)):
+        return Path(file).read_bytes()
+    return file.getvalue()
+
+# 單張遮罩快取的總位元組上限：每筆含 TARGET_SIZE 縮放圖與遮罩（約 4 MB），
+# 1 GiB 可容納建議上限 200 張的整批再加上餘裕，重跑同一批時不會依 LRU 順序互相逐出
+_MASK_CACHE_BYTES = 1 << 30
+_MASK_CACHE_LOCK = threading.Lock()
+# 跨 session 共用的單張遮罩 LRU 快取，key 為（內容摘要、模型識別、信心門檻）；
+# 模組只匯入一次，直接用模組層級物件，不必每次重繪都經過 st.cache_resource 查找
+_MASK_CACHE: "OrderedDict[Tuple[str, str, float], Dict[str, Any]]" = OrderedDict()
+# _MASK_CACHE 目前佔用的位元組數（於 _MASK_CACHE_LOCK 內更新）
+_mask_cache_size = 0
+
+def _record_nbytes(record: Dict[str, Any]) -> int:
+    """遮罩紀錄中陣列佔用的位元組數（失敗的紀錄不含陣列）"""
+    return sum(record[k].nbytes for k in ('resized_image', 'mask') if record.get(k) is not None)
+
+def _decode_files(files: List[Tuple[str, bytes]]):
+    """
+    依序產出 (檔名, RGB 影像)；每 BATCH_SIZE 張為一批，JPEG 以 GPU（nvJPEG）解碼並留在顯存交給縮放，
+    其餘以執行緒池交給 Pillow。下一批在背景解碼、與本批的推論重疊，顯存中最多只有兩批解碼結果。
+    """
+    chunks = [range(start, min(start + BATCH_SIZE, len(files))) for start in range(0, len(files), BATCH_SIZE)]
+
+    def cpu_decode(i: int) -> np.ndarray:
+        return _load_rgb_array(BytesIO(files[i][1]))
+
+    # Pillow 解碼時會釋放 GIL
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as gpu_ex, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as cpu_ex:
+
+        def submit(chunk: range):
+            jpeg = [i for i in chunk if files[i][1][:2] == b"\xff\xd8"]
+            if len(jpeg) <= 1:
+                jpeg = []
+            gpu = gpu_ex.submit(batch_decode_jpeg_cuda, [files[i][1] for i in jpeg]) if jpeg else None
+            jpeg_set = set(jpeg)
+            cpu = {i: cpu_ex.submit(cpu_decode, i) for i in chunk if i not in jpeg_set}
+            return jpeg, gpu, cpu
+
+        pending = submit(chunks[0]) if chunks else None
+        for k, chunk in enumerate(chunks):
+            jpeg, gpu, cpu = pending
+            decoded = gpu.result() if gpu is not None else None
+            if decoded is None:
+                # GPU 解碼不可用或失敗：本批 JPEG 改交給 Pillow
+                cpu.update({i: cpu_ex.submit(cpu_decode, i) for i in jpeg})
+                gpu_decoded = {}
+            else:
+                gpu_decoded = dict(zip(jpeg, decoded))
+            # 本批交出去推論前，先排入下一批的解碼
+            pending = submit(chunks[k + 1]) if k + 1 < len(chunks) else None
+            for i in chunk:
+                img = gpu_decoded.pop(i, None)
+                yield files[i][0], img if img is not None else cpu[i].result()
+
+def _infer_masks(
+    predictor,
+    files: Tuple[Tuple[str, bytes], ...],
+    digests: List[str],
+    conf_threshold: float,
+) -> List[Dict[str, Any]]:
+    """
+    YOLO 遮罩以單張為單位快取（內容摘要 + 模型權重摘要 + 信心門檻）：
+    重新上傳、增減部分圖片或只改其他參數時，只有沒推論過的圖片會送進 GPU
+    """
+    global _mask_cache_size
+    cache = _MASK_CACHE
+    keys = [(digest, predictor.model_id, conf_threshold) for digest in digests]
+    records: List[Optional[Dict[str, Any]]] = [None] * len(files)
+    with _MASK_CACHE_LOCK:
+        for i, key in enumerate(keys):
+            if key in cache:
+                cache.move_to_end(key)
+                records[i] = cache[key]
+
+    missing = [i for i, record in enumerate(records) if record is None]
+    if missing:
+        inferred = infer_batch_masks(predictor, _decode_files([files[i] for i in missing]), conf_threshold=conf_threshold)
+        with _MASK_CACHE_LOCK:
+            for i, record in zip(missing, inferred):
+                old = cache.pop(keys[i], None)
+                if old is not None:
+                    _mask_cache_size -= _record_nbytes(old)
+                records[i] = cache[keys[i]] = record
+                _mask_cache_size += _record_nbytes(record)
+            # 依總位元組逐出最久未用的紀錄（至少保留本次剛加入的最後一筆）
+            while _mask_cache_size > _MASK_CACHE_BYTES and len(cache) > 1:
+                _, evicted = cache.popitem(last=False)
+                _mask_cache_size -= _record_nbytes(evicted)
+
+    # 快取的紀錄為各 session 共用，以淺複製帶上本次的檔名
+    return [{**record, 'filename': name} for record, (name, _) in zip(records, files)]
+
+# 用 cache_resource：結果含縮放後的整張圖片，cache_data 每次命中都要 pickle 複製一份；
+# 下游（render_line_results / Visualizer）只讀不改，直接共用同一份物件
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _cached_lines(
+    _masks: List[Dict[str, Any]],
+    files_key: Tuple[Tuple[str, str], ...],
+    model_id: str,
+    conf_threshold: float,
+    region: Optional[Tuple[int, int, int, int]],
+    line_config: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """
+    直線提取結果依（遮罩來源、region、直線參數）快取；重繪或只改顯示參數時直接沿用。
+    _masks 不參與雜湊，改以 files_key（檔名 + 內容摘要）與推論參數識別。
+    """
+    return extract_batch_lines(_masks, region=region, line_config=line_config)
+
+def _files_key(files: Tuple[Tuple[str, bytes], ...]) -> Tuple[Tuple[str, str], ...]:
+    """檔名 + 內容摘要，作為遮罩與直線快取的 key（避免再次雜湊整份圖片內容）"""
+    return tuple((name, hashlib.blake2b(data, digest_size=16).hexdigest()) for name, data in files)
+
+# 目前 session 中上傳檔案的簽章
+_UPLOAD_SIGNATURE_KEY = f"{IMAGE_UPLOAD_SESSION_KEY}_signature"
+
 # 上傳區
 def upload_images(cache: bool = True) -> List[FileLike]:
     # 移除舊版存放於 session_state 的 UploadedFile
@@ -70,11 +263,17 @@ def upload_images(cache: bool = True) -> List[FileLike]:
         accept_multiple_files=True,
     )
 
-    # 若本次有新的上傳檔案，立即序列化並存入 session_state
+    # 若本次有新的上傳檔案，立即序列化並存入 session_state；
+    # 以 (file_id, 檔名, 大小) 簽章比對，上傳內容沒變的重繪直接沿用，不必再複製每個檔案的 bytes
     new_serialized = None
     if uploads:
-        new_serialized = _serialize_uploaded_files(uploads)
-        st.session_state[IMAGE_UPLOAD_SESSION_KEY] = new_serialized
+        signature = tuple((f.file_id, f.name, f.size) for f in uploads)
+        if st.session_state.get(_UPLOAD_SIGNATURE_KEY) == signature and IMAGE_UPLOAD_SESSION_KEY in st.session_state:
+            new_serialized = st.session_state[IMAGE_UPLOAD_SESSION_KEY]
+        else:
+            new_serialized = _serialize_uploaded_files(uploads)
+            st.session_state[IMAGE_UPLOAD_SESSION_KEY] = new_serialized
+            st.session_state[_UPLOAD_SIGNATURE_KEY] = signature
 
     # 根據 cache 參數決定要使用本次上傳或既有快取，並還原成可讀取的 file-like 物件
     files_to_use: List[FileLike] = []
@@ -88,6 +287,7 @@ def upload_images(cache: bool = True) -> List[FileLike]:
     show_clear_button = st.button(get_text('clear_images'))
     if show_clear_button:
         st.session_state.pop(IMAGE_UPLOAD_SESSION_KEY, None)
+        st.session_state.pop(_UPLOAD_SIGNATURE_KEY, None)
         files_to_use = []
         st.rerun()
 
@@ -109,22 +309,34 @@ def handle_image_processing(
     
     col1, col2 = st.columns(2)
     if col1.button(get_text('start_image_batch_processing')):
-        imgs = [(f.name, Image.open(f)) for f in uploads]
+        files = tuple((f.name, _file_bytes(f)) for f in uploads)
         progress = st.progress(0)
-        total_batches = math.ceil(len(imgs)/BATCH_SIZE)
-        st.info(get_text('batch_processing_summary').format(count=len(imgs), batches=total_batches))
-        results = process_batch_images(
-            predictor=st.session_state.predictor,
-            images=imgs,
-            pixel_size_mm=params['pixel_size_mm'],
+        total_batches = math.ceil(len(files)/BATCH_SIZE)
+        st.info(get_text('batch_processing_summary').format(count=len(files), batches=total_batches))
+        predictor = st.session_state.predictor
+        files_key = _files_key(files)
+        masks = _infer_masks(
+            predictor,
+            files,
+            [digest for _, digest in files_key],
+            conf_threshold=params['confidence_threshold'],
+        )
+        inferred = _cached_lines(
+            masks,
+            files_key,
+            predictor.model_id,
             conf_threshold=params['confidence_threshold'],
-            region=region,
+            region=tuple(region) if region is not None else None,
             line_config={
                 'sample_interval': params['sample_interval'],
                 'gradient_search_top': params['gradient_search_top'],
                 'gradient_search_bottom': params['gradient_search_bottom'],
                 'keep_ratio': params['keep_ratio']
             },
+        )
+        results = render_line_results(
+            inferred,
+            pixel_size_mm=params['pixel_size_mm'],
             vis_config={
                 'line_color': params['line_color'],
                 'line_thickness': params['line_thickness'],
@@ -155,6 +367,7 @@ def image_results():
     st.markdown(get_text('image_success_ratio').format(success=len(succ), total=len(res)))
 
     if succ:
+        encoded = _download_payload(res)['images']
         cols_per_row = 2
         rows = math.ceil(len(succ) / cols_per_row)
         for row in range(rows):
@@ -179,10 +392,9 @@ def image_results():
                             st.metric(get_text('std_length'), f"{stats['std_length']:.2f} mm")
                             st.metric(get_text('max_length'), f"{stats['max_length']:.2f} mm")
                             st.metric(get_text('min_length'), f"{stats['min_length']:.2f} mm")
-                    img_buffer = _image_to_bytes(r['result'])
                     st.download_button(
                         get_text('download_single_image'),
-                        img_buffer.getvalue(),
+                        encoded[i],
                         f"{r['filename']}.jpg",
                         "image/jpeg",
                         key=f"download_single_image_{i}_{r['filename']}",
@@ -199,16 +411,10 @@ def image_downloads():
         return
 
     st.subheader(get_text('download_results'))
-    buf_xl = generate_excel_img_results(st.session_state.img_results)
-    buf_zip = BytesIO()
-    with zipfile.ZipFile(buf_zip, 'w') as zf:
-        for r in imgs:
-            img_buffer = _image_to_bytes(r['result'])
-            zf.writestr(f"images/{r['filename']}.jpg", img_buffer.getvalue())
-        zf.writestr("image_results.xlsx", buf_xl.getvalue())
+    payload = _download_payload(st.session_state.img_results)
 
     col1, col2 = st.columns(2)
-    col1.download_button(get_text('download_zip'), buf_zip.getvalue(), "image_results.zip", "application/zip")
-    col2.download_button(get_text('download_excel'), buf_xl.getvalue(),
+    col1.download_button(get_text('download_zip'), payload['zip'], "image_results.zip", "application/zip")
+    col2.download_button(get_text('download_excel'), payload['excel'],
                          "image_results.xlsx",
                          "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
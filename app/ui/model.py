@@ -2,7 +2,6 @@ import streamlit as st
 
 from config import (
     AVAILABLE_MODELS,
-    DEFAULT_MODEL,
     # config manager
     file_storage_manager,
     # language
@@ -12,18 +11,22 @@ from config import (
     get_model_path,
 )
 
+# 模型名稱 -> 選單位置，模組載入時建立一次
+_MODEL_NAMES = tuple(AVAILABLE_MODELS)
+_MODEL_INDEX = {name: i for i, name in enumerate(_MODEL_NAMES)}
+
 def model_section():
     """渲染模型選擇區域（側欄）"""
     st.subheader(get_text('model_selection'))
 
     current_config = file_storage_manager.get_current_config()
-    current_model = current_config.get('selected_model', DEFAULT_MODEL)
+    current_model = current_config.selected_model
 
     # 模型選擇器
     selected_model = st.selectbox(
         get_text('select_model'),
-        options=list(AVAILABLE_MODELS.keys()),
-        index=list(AVAILABLE_MODELS.keys()).index(current_model),
+        options=_MODEL_NAMES,
+        index=_MODEL_INDEX.get(current_model, 0),
         key='model_selector',
         help=get_text('select_model_help')
     )
@@ -42,7 +45,7 @@ def model_section():
 
     # 自動載入預設模型（如果還沒載入）
     if st.session_state.predictor is None:
-        current_model = current_config.get('selected_model', current_model)
+        current_model = current_config.selected_model
         switch_model(current_model)
 
     # 模型狀態顯示
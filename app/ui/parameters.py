@@ -2,153 +2,150 @@ import streamlit as st
 
 from config import (
     BATCH_SIZE,
-    get_text,
+    COLOR_KEYS,
+    DEFAULT_CONFIG,
+    K,
+    color_for,
+    color_index,
+    get_colors,
+    get_labels,
 )
 
+
 def parameters_section():
     """渲染參數配置區域（側欄），並回傳參數字典"""
-    st.subheader(get_text('basic_params'))
+    labels = get_labels()
+    st.subheader(labels[K.BASIC_PARAMS])
 
     if 'pixel_size_mm' not in st.session_state:
-        st.session_state['pixel_size_mm'] = 0.05
+        st.session_state['pixel_size_mm'] = DEFAULT_CONFIG['pixel_size_mm']
     pixel_size_mm = st.number_input(
-        get_text('pixel_size'),
+        labels[K.PIXEL_SIZE],
         min_value=0.01,
         max_value=1.0,
         step=0.01,
         key='pixel_size_mm',
-        help=get_text('pixel_size_help')
+        help=labels[K.PIXEL_SIZE_HELP]
     )
 
     if 'confidence_threshold' not in st.session_state:
-        st.session_state['confidence_threshold'] = 0.4
+        st.session_state['confidence_threshold'] = DEFAULT_CONFIG['confidence_threshold']
     confidence_threshold = st.slider(
-        get_text('confidence_threshold'),
+        labels[K.CONFIDENCE_THRESHOLD],
         min_value=0.1,
         max_value=1.0,
         step=0.05,
         key='confidence_threshold',
-        help=get_text('confidence_threshold_help')
+        help=labels[K.CONFIDENCE_THRESHOLD_HELP]
     )
 
     # 線條提取參數
-    st.subheader(get_text('line_extraction'))
+    st.subheader(labels[K.LINE_EXTRACTION])
     if 'sample_interval' not in st.session_state:
-        st.session_state['sample_interval'] = 5
+        st.session_state['sample_interval'] = DEFAULT_CONFIG['sample_interval']
     sample_interval = st.number_input(
-        get_text('sample_interval'),
+        labels[K.SAMPLE_INTERVAL],
         min_value=1,
         max_value=100,
         step=1,
         key='sample_interval',
-        help=get_text('sample_interval_help')
+        help=labels[K.SAMPLE_INTERVAL_HELP]
     )
 
     if 'gradient_search_top' not in st.session_state:
-        st.session_state['gradient_search_top'] = 5
+        st.session_state['gradient_search_top'] = DEFAULT_CONFIG['gradient_search_top']
     gradient_search_top = st.number_input(
-        get_text('gradient_search_top'),
+        labels[K.GRADIENT_SEARCH_TOP],
         min_value=1,
         max_value=50,
         step=1,
         key='gradient_search_top',
-        help=get_text('gradient_search_top_help')
+        help=labels[K.GRADIENT_SEARCH_TOP_HELP]
     )
 
     if 'gradient_search_bottom' not in st.session_state:
-        st.session_state['gradient_search_bottom'] = 5
+        st.session_state['gradient_search_bottom'] = DEFAULT_CONFIG['gradient_search_bottom']
     gradient_search_bottom = st.number_input(
-        get_text('gradient_search_bottom'),
+        labels[K.GRADIENT_SEARCH_BOTTOM],
         min_value=1,
         max_value=50,
         step=1,
         key='gradient_search_bottom',
-        help=get_text('gradient_search_bottom_help')
+        help=labels[K.GRADIENT_SEARCH_BOTTOM_HELP]
     )
 
     if 'keep_ratio' not in st.session_state:
-        st.session_state['keep_ratio'] = 0.3
+        st.session_state['keep_ratio'] = DEFAULT_CONFIG['keep_ratio']
     keep_ratio = st.slider(
-        get_text('keep_ratio'),
+        labels[K.KEEP_RATIO],
         min_value=0.1,
         max_value=1.0,
         step=0.1,
         key='keep_ratio',
-        help=get_text('keep_ratio_help')
+        help=labels[K.KEEP_RATIO_HELP]
     )
 
     # 視覺化參數
-    st.subheader(get_text('visualization'))
+    st.subheader(labels[K.VISUALIZATION])
     if 'line_thickness' not in st.session_state:
-        st.session_state['line_thickness'] = 1
+        st.session_state['line_thickness'] = DEFAULT_CONFIG['line_thickness']
     line_thickness = st.number_input(
-        get_text('line_thickness'),
+        labels[K.LINE_THICKNESS],
         min_value=1,
         max_value=10,
         step=1,
         key='line_thickness',
-        help=get_text('line_thickness_help')
+        help=labels[K.LINE_THICKNESS_HELP]
     )
 
     if 'line_alpha' not in st.session_state:
-        st.session_state['line_alpha'] = 0.7
+        st.session_state['line_alpha'] = DEFAULT_CONFIG['line_alpha']
     line_alpha = st.slider(
-        get_text('line_alpha'),
+        labels[K.LINE_ALPHA],
         min_value=0.1,
         max_value=1.0,
         step=0.1,
         key='line_alpha',
-        help=get_text('line_alpha_help')
+        help=labels[K.LINE_ALPHA_HELP]
     )
 
     if 'display_labels' not in st.session_state:
-        st.session_state['display_labels'] = True
+        st.session_state['display_labels'] = DEFAULT_CONFIG['display_labels']
     display_labels = st.checkbox(
-        get_text('display_labels'),
+        labels[K.DISPLAY_LABELS],
         key='display_labels',
-        help=get_text('display_labels_help')
+        help=labels[K.DISPLAY_LABELS_HELP]
     )
 
     # 是否開啟區域限制
     if 'region_limit' not in st.session_state:
-        st.session_state['region_limit'] = True
+        st.session_state['region_limit'] = DEFAULT_CONFIG['region_limit']
     region_limit = st.checkbox(
-        get_text('region_limit'),
+        labels[K.REGION_LIMIT],
         key='region_limit',
-        help=get_text('region_limit_help')
+        help=labels[K.REGION_LIMIT_HELP]
     )
 
     # 線條顏色選擇 (使用語言無關的 key)
-    color_keys = ['color_green', 'color_red', 'color_blue', 'color_white', 'color_yellow']
-    color_values = {
-        'color_green': (0, 255, 0),
-        'color_red': (0, 0, 255),
-        'color_blue': (255, 0, 0),
-        'color_white': (255, 255, 255),
-        'color_yellow': (0, 255, 255)
-    }
-
-    # 取得當前選中的顏色 index
+    # 取得當前選中的顏色 index（預先建好的 key -> index 表，不必每次重繪線性搜尋）
     if 'line_color_option' not in st.session_state:
-        st.session_state['line_color_option'] = 'color_green'
-    current_color = st.session_state['line_color_option']
-    color_index = color_keys.index(current_color) if current_color in color_keys else 0
+        st.session_state['line_color_option'] = DEFAULT_CONFIG['line_color_option']
 
     line_color_option = st.selectbox(
-        get_text('line_color'),
-        options=color_keys,
-        index=color_index,
-        format_func=lambda x: get_text(x),
+        labels[K.LINE_COLOR],
+        options=COLOR_KEYS,
+        index=color_index(st.session_state['line_color_option']),
+        format_func=get_colors().__getitem__,
         key='line_color_option',
-        help=get_text('line_color_help'),
+        help=labels[K.LINE_COLOR_HELP],
     )
 
-    line_color = color_values.get(line_color_option, (0, 255, 0))
+    line_color = color_for(line_color_option)
 
     # 批次處理資訊
-    st.subheader(get_text('batch_processing'))
-    st.info(f"{get_text('batch_size_info')}: {BATCH_SIZE} {get_text('images_text')}")
-    st.info(get_text('batch_efficiency'))
+    st.subheader(labels[K.BATCH_PROCESSING])
+    st.info(f"{labels[K.BATCH_SIZE_INFO]}: {BATCH_SIZE} {labels[K.IMAGES_TEXT]}")
+    st.info(labels[K.BATCH_EFFICIENCY])
 
     return {
         'pixel_size_mm': pixel_size_mm,
@@ -3,7 +3,6 @@ import streamlit as st
 from config import (
     DEFAULT_CONFIGS,
     DEFAULT_CONFIG_KEY,
-    DEFAULT_MODEL,
     # config manager
     file_storage_manager,
     # language
@@ -29,7 +28,7 @@ def settings_section():
     config_names = list(available_configs.keys())
     current_config_name = file_storage_manager.get_current_config_name()
     current_config = file_storage_manager.get_current_config()
-    current_model = current_config.get('selected_model', DEFAULT_MODEL)
+    current_model = current_config.selected_model
 
     selected_config_name = st.selectbox(
         get_text('select_config'),
@@ -24,14 +24,32 @@ from ui import (
     video_intervals,
 )
 
-@st.cache_data(show_spinner=False)
-def get_first_frame(video_path: str) -> Optional[np.ndarray]:
+# 用 cache_resource：region 模式下每次重繪都會取第一幀，不必每次 pickle 複製整張影格（canvas 只讀不改）
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _first_frame(video_path: str, mtime_ns: int, size: int) -> Optional[np.ndarray]:
+    """快取 key 含檔案的 mtime / 大小：同一路徑的影片被重新下載或壓縮覆寫後不會沿用舊的第一幀"""
     cap = cv2.VideoCapture(video_path)
     ok, frame = cap.read()
     cap.release()
     if not ok or frame is None:
         return None
     return frame
+
+def get_first_frame(video_path: str) -> Optional[np.ndarray]:
+    stat = os.stat(video_path)
+    return _first_frame(video_path, stat.st_mtime_ns, stat.st_size)
+
+# Excel 下載內容的 session 快取
+_EXCEL_CACHE_KEY = "video_excel_cache"
+
+def _excel_bytes(results: Dict[str, IntervalStat]) -> bytes:
+    """結果更新後才重新產生 Excel，之後的重繪直接沿用（以 video_results 物件本身識別）"""
+    cached = st.session_state.get(_EXCEL_CACHE_KEY)
+    if cached is not None and cached[0] is results:
+        return cached[1]
+    data = generate_excel_video_results(results).getvalue()
+    st.session_state[_EXCEL_CACHE_KEY] = (results, data)
+    return data
   
 def handle_video_processing(
     video_path: Path,
@@ -152,7 +170,6 @@ def video_downloads():
     if not st.session_state.video_results:
         return
     st.subheader(get_text('download_results'))
-    buf_xl = generate_excel_video_results(st.session_state.video_results)
-    st.download_button(get_text('download_excel'), buf_xl.getvalue(),
+    st.download_button(get_text('download_excel'), _excel_bytes(st.session_state.video_results),
                          "video_results.xlsx",
                          "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
\ No newline at end of file
@@ -1,6 +1,5 @@
 import streamlit as st
 import re
-import pandas as pd
 from typing import List, Tuple, Optional
 
 from config import get_text
@@ -154,12 +153,17 @@ def video_intervals(
     if not intervals:
         st.info(get_text('intervals_empty'))
     else:
+        # 延遲匯入：只有實際有區間要顯示時才載入 pandas
+        import pandas as pd
+
         # 建 DataFrame（只建一次）
         df = pd.DataFrame(intervals, columns=["start_s", "end_s"])
-        df["duration_s"] = df["end_s"] - df["start_s"]
-        df["start_hms"] = df["start_s"].apply(_seconds_to_hms)
-        df["end_hms"] = df["end_s"].apply(_seconds_to_hms)
-        df["label"] = df.apply(lambda r: f"{_seconds_to_hms(r.start_s)} → {_seconds_to_hms(r.end_s)} ({r.duration_s:.2f}s)", axis=1)
+        # 標籤直接由區間 tuple 組出：不用 df.apply(axis=1)（每列都要建一個 Series 再呼叫 lambda），
+        # 每個時間也只格式化一次
+        df["label"] = [
+            f"{_seconds_to_hms(s)} → {_seconds_to_hms(e)} ({float(e) - float(s):.2f}s)"
+            for s, e in intervals
+        ]
 
         # 若筆數很少，顯示完整 table；若很多則分頁顯示（每頁 25）
         MAX_PER_PAGE = 25
@@ -1,4 +1,4 @@
 from .image import batch_uniform_resize
-from .image_gpu import batch_uniform_resize_cuda
+from .image_gpu import batch_decode_jpeg_cuda, batch_encode_jpeg_cuda, batch_uniform_resize_cuda
 
-__all__ = ["batch_uniform_resize", "batch_uniform_resize_cuda"]
\ No newline at end of file
+__all__ = ["batch_uniform_resize", "batch_uniform_resize_cuda", "batch_decode_jpeg_cuda", "batch_encode_jpeg_cuda"]
\ No newline at end of file
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
@@ -33,21 +33,18 @@ def _to_bchw_uint8_device(image: np.ndarray, device: torch.device) -> torch.Tens
     # (H,W,C) -> (1,C,H,W)
     return t.permute(2, 0, 1).unsqueeze(0).to(dtype=torch.uint8)
 
-@torch.inference_mode()
-def uniform_resize_and_pad_cuda(
-    image: np.ndarray,
-    target_size: Tuple[int, int] = TARGET_SIZE
-) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+def _letterbox_bchw(
+    bchw_u8: torch.Tensor,
+    target_size: Tuple[int, int],
+) -> Tuple[torch.Tensor, float, Tuple[int, int]]:
     """
-    用 PyTorch 在 GPU（若可用）完成等比縮放 + letterbox。
-    回傳：padded numpy(BGR/灰階), scale, (pad_left, pad_top)
+    對 (N,C,H,W) uint8 tensor 做等比縮放 + letterbox（同一批次尺寸需相同）。
+    回傳：padded uint8 tensor, scale, (pad_left, pad_top)
     """
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-
     th = int(target_size[1])
     tw = int(target_size[0])
 
-    h, w = image.shape[:2]
+    h, w = bchw_u8.shape[-2:]
     scale = min(tw / w, th / h)
     nw, nh = int(round(w * scale)), int(round(h * scale))
 
@@ -56,9 +53,6 @@ def uniform_resize_and_pad_cuda(
     pad_left   = (tw - nw) // 2
     pad_right  = tw - nw - pad_left
 
-    # 上傳成 (1,C,H,W) uint8
-    bchw_u8 = _to_bchw_uint8_device(image, device=device)
-
     # 轉 float 做插值
     bchw_f = bchw_u8.to(dtype=torch.float32)
 
@@ -69,36 +63,113 @@ def uniform_resize_and_pad_cuda(
     padded = F.pad(resized, (pad_left, pad_right, pad_top, pad_bottom), value=0)
 
     # 回到 uint8
-    padded_u8 = padded.clamp_(0, 255).to(torch.uint8)
+    return padded.clamp_(0, 255).to(torch.uint8), scale, (pad_left, pad_top)
 
-    # 轉回 numpy（H,W,C 或 H,W,1）
-    np_out = padded_u8.squeeze(0).permute(1, 2, 0).contiguous().cpu().numpy()
-    if np_out.shape[2] == 1:
-        np_out = np_out[:, :, 0]  # 灰階保持 2D
+def _bchw_to_numpy(bchw_u8: torch.Tensor) -> List[np.ndarray]:
+    """(N,C,H,W) uint8 tensor 一次搬回 CPU，拆成 N 張 numpy（H,W,C 或 H,W）"""
+    np_out = bchw_u8.permute(0, 2, 3, 1).contiguous().cpu().numpy()
+    if np_out.shape[3] == 1:
+        np_out = np_out[..., 0]  # 灰階保持 2D
+    return list(np_out)
 
-    return np_out, scale, (pad_left, pad_top)
+@torch.inference_mode()
+def uniform_resize_and_pad_cuda(
+    image: np.ndarray,
+    target_size: Tuple[int, int] = TARGET_SIZE
+) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """
+    用 PyTorch 在 GPU（若可用）完成等比縮放 + letterbox。
+    回傳：padded numpy(BGR/灰階), scale, (pad_left, pad_top)
+    """
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
+    # 上傳成 (1,C,H,W) uint8
+    bchw_u8 = _to_bchw_uint8_device(image, device=device)
+    padded_u8, scale, padding = _letterbox_bchw(bchw_u8, target_size)
+    return _bchw_to_numpy(padded_u8)[0], scale, padding
+
+def _upload_nchw(
+    images: List[Union[np.ndarray, torch.Tensor]],
+    indices: List[int],
+    device: torch.device,
+    stream: Optional["torch.cuda.Stream"] = None,
+) -> torch.Tensor:
+    """
+    將同尺寸的多張圖片疊成 (N,C,H,W) uint8 tensor 並放到指定裝置。
+    - CUDA：經 pinned memory + non_blocking 在指定 stream 上傳，可與其他 stream 的運算重疊。
+    - 已在裝置上的 tensor（例如 GPU 解碼的結果）直接在裝置上堆疊，不經過 CPU。
+    """
+    if isinstance(images[indices[0]], torch.Tensor):
+        stacked_t = torch.stack([images[i] for i in indices]).to(device)
+        if stacked_t.ndim == 3:  # 灰階 -> (N,H,W,1)
+            stacked_t = stacked_t[..., None]
+        return stacked_t.permute(0, 3, 1, 2)
+    stacked = np.stack([images[i] for i in indices])
+    if stacked.ndim == 3:  # 灰階 -> (N,H,W,1)
+        stacked = stacked[..., None]
+    t = torch.from_numpy(stacked)
+    if stream is None:
+        t = t.to(device)
+    else:
+        with torch.cuda.stream(stream):
+            t = t.pin_memory().to(device, non_blocking=True)
+    # (N,H,W,C) -> (N,C,H,W)
+    return t.permute(0, 3, 1, 2)
 
 @torch.inference_mode()
 def batch_uniform_resize_cuda(
-    images: List[np.ndarray],
+    images: List[Union[np.ndarray, torch.Tensor]],
     target_size: Tuple[int, int] = TARGET_SIZE,
     *,
     save_dir: Optional[Union[str, Path]] = None,
-    prefix: str = "resized_"
+    prefix: str = "resized_",
+    chunk_size: int = 8,
 ) -> List[UniformResizeResult]:
     """
     批次處理版本。維持原有回傳型別與欄位。
-    注意：這裡仍逐張 loop（控制流程在 Python），但重運算在 PyTorch（GPU/CPU）執行。
+    相同尺寸的圖片每 chunk_size 張疊成一個 (N,C,H,W) tensor，一次上傳、插值並搬回 CPU；
+    chunk_size 限制單次 float32 插值的顯存用量。
+    CUDA 上以獨立的 copy stream 預先上傳下一個 chunk，與目前 chunk 的插值重疊。
+    images 也可以是已在 GPU 上的 (H,W,C) uint8 tensor（batch_decode_jpeg_cuda 的結果），省去來回搬運。
     """
     out_dir: Optional[Path] = None
     if save_dir is not None:
         out_dir = Path(save_dir)
         out_dir.mkdir(parents=True, exist_ok=True)
 
-    results: List[UniformResizeResult] = []
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+    # 依原始尺寸分組（通常整批上傳的圖片尺寸相同，只會有一組）
+    groups: Dict[Tuple[Any, ...], List[int]] = {}
     for i, img in enumerate(images):
-        padded, scale, padding = uniform_resize_and_pad_cuda(img, target_size)
+        # tensor 與 ndarray 分開分組：同一個 chunk 需以同一種方式堆疊
+        groups.setdefault((isinstance(img, torch.Tensor), tuple(img.shape)), []).append(i)
+
+    chunks = [
+        group[start : start + chunk_size]
+        for group in groups.values()
+        for start in range(0, len(group), chunk_size)
+    ]
+    copy_stream = torch.cuda.Stream() if device.type == "cuda" else None
+
+    outputs: List[Optional[Tuple[np.ndarray, float, Tuple[int, int]]]] = [None] * len(images)
+    next_t = _upload_nchw(images, chunks[0], device, copy_stream) if chunks else None
+    for k, indices in enumerate(chunks):
+        t = next_t
+        if copy_stream is not None:
+            # 等待本 chunk 上傳完成，並告知快取配置器此 tensor 會在目前 stream 使用
+            compute_stream = torch.cuda.current_stream()
+            compute_stream.wait_stream(copy_stream)
+            t.record_stream(compute_stream)
+        padded_u8, scale, padding = _letterbox_bchw(t, target_size)
+        # 本 chunk 的插值已非同步排入，趁此準備並上傳下一個 chunk（.cpu() 會同步，需在此之前）
+        if k + 1 < len(chunks):
+            next_t = _upload_nchw(images, chunks[k + 1], device, copy_stream)
+        for i, padded in zip(indices, _bchw_to_numpy(padded_u8)):
+            outputs[i] = (padded, scale, padding)
+
+    results: List[UniformResizeResult] = []
+    for i, (padded, scale, padding) in enumerate(outputs):
         saved_path = None
         if out_dir is not None:
             p = out_dir / f"{prefix}{i:04d}.jpg"
@@ -111,4 +182,53 @@ def batch_uniform_resize_cuda(
             padding=padding,
             saved_path=saved_path
         ))
-    return results
\ No newline at end of file
+    return results
+
+@torch.inference_mode()
+def batch_decode_jpeg_cuda(datas: List[bytes]) -> Optional[List[torch.Tensor]]:
+    """
+    以 GPU（torchvision.io.decode_jpeg 的 nvJPEG 路徑）批次解碼 JPEG，回傳留在 GPU 上的 RGB (H,W,3) uint8 tensor，
+    可直接交給 batch_uniform_resize_cuda；呼叫端應分批解碼以限制顯存用量。
+    無 CUDA，或 torchvision 版本不支援 GPU 解碼時回傳 None，由呼叫端改用 CPU 解碼。
+    """
+    if not datas or not torch.cuda.is_available():
+        return None
+    try:
+        from torchvision.io import ImageReadMode, decode_jpeg
+
+        # bytearray：frombuffer 需要可寫入的緩衝區
+        tensors = [torch.frombuffer(bytearray(data), dtype=torch.uint8) for data in datas]
+        decoded = decode_jpeg(tensors, mode=ImageReadMode.RGB, device="cuda")
+        # (C,H,W) -> (H,W,C)，與 ndarray 的排列一致
+        return [t.permute(1, 2, 0) for t in decoded]
+    except (ImportError, RuntimeError, TypeError) as e:
+        print(f"GPU JPEG 解碼失敗，改用 CPU 解碼: {e}")
+        return None
+
+@torch.inference_mode()
+def batch_encode_jpeg_cuda(
+    images: List[np.ndarray],
+    quality: int = 75,
+) -> Optional[List[bytes]]:
+    """
+    以 GPU（torchvision.io.encode_jpeg 的 nvJPEG 路徑）批次編碼 JPEG。
+    無 CUDA，或 torchvision 版本不支援 GPU 編碼時回傳 None，由呼叫端改用 CPU 編碼。
+    """
+    if not images or not torch.cuda.is_available():
+        return None
+    try:
+        from torchvision.io import encode_jpeg
+
+        device = torch.device("cuda")
+        tensors = []
+        for img in images:
+            if img.ndim == 2:  # 灰階 -> (H,W,1)
+                img = img[:, :, None]
+            t = torch.from_numpy(np.ascontiguousarray(img)).pin_memory().to(device, non_blocking=True)
+            # (H,W,C) -> (C,H,W)
+            tensors.append(t.permute(2, 0, 1).contiguous())
+        encoded = encode_jpeg(tensors, quality=quality)
+        return [t.cpu().numpy().tobytes() for t in encoded]
+    except (ImportError, RuntimeError, TypeError) as e:
+        print(f"GPU JPEG 編碼失敗，改用 CPU 編碼: {e}")
+        return None
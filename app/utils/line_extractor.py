@@ -1,16 +1,160 @@
-from typing import List, Tuple, Optional
+import threading
+from functools import lru_cache
+from typing import List, Tuple, Optional, Union
 import numpy as np
 import cv2
 from config import LINE_CONFIG
 
+try:
+    from numba import njit
+except ImportError:
+    # 未安裝 numba 時使用 NumPy 向量化版本
+    njit = None
+
+# 每個執行緒各自快取 CLAHE 物件：cv2 的 CLAHE 在 apply 時會重用內部暫存緩衝，
+# Streamlit 多個 session 以不同執行緒同時處理時不能共用同一個實例
+_clahe_local = threading.local()
+
+@lru_cache(maxsize=1)
+def _opencv_cuda_available() -> bool:
+    """OpenCV 是否以 CUDA 編譯且有可用的 GPU（pip 版 opencv-python 沒有 cv2.cuda 功能，回傳 False）"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+# cv2.cuda 的 CLAHE 曾失敗時設為 True，之後直接走 CPU，不再每張圖重試並重複輸出錯誤
+_cuda_clahe_failed = False
+
+def _get_clahe(clip_limit: float = 4.0, tile_grid_size: Tuple[int, int] = (16, 16), cuda: bool = False):
+    """取得目前執行緒、指定參數的 CLAHE 物件（第一次使用時建立；cuda=True 時為 cv2.cuda 版本）"""
+    cache = getattr(_clahe_local, "cache", None)
+    if cache is None:
+        cache = _clahe_local.cache = {}
+    key = (clip_limit, tile_grid_size, cuda)
+    clahe = cache.get(key)
+    if clahe is None:
+        create = cv2.cuda.createCLAHE if cuda else cv2.createCLAHE
+        clahe = cache[key] = create(clipLimit=clip_limit, tileGridSize=tile_grid_size)
+    return clahe
+
+def _enhanced_gray(img: np.ndarray) -> np.ndarray:
+    """
+    灰階 + CLAHE；OpenCV 支援 CUDA 時在 GPU 上執行，失敗則退回 CPU（之後一律使用 CPU）。
+    注意 cv2.cuda 的 CLAHE 與 CPU 版結果並非逐位元相同，量測值會隨 OpenCV 的編譯方式略有差異。
+    """
+    global _cuda_clahe_failed
+    if not _cuda_clahe_failed and _opencv_cuda_available():
+        try:
+            gpu = cv2.cuda_GpuMat()
+            gpu.upload(np.ascontiguousarray(img))
+            if img.ndim == 3:
+                gpu = cv2.cuda.cvtColor(gpu, cv2.COLOR_BGR2GRAY)
+            return _get_clahe(cuda=True).apply(gpu, cv2.cuda.Stream_Null()).download()
+        except cv2.error as e:
+            _cuda_clahe_failed = True
+            print(f"CUDA CLAHE 失敗，之後改用 CPU: {e}")
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    return _get_clahe().apply(gray)
+
+# numba 核心；未安裝、無法建立或執行失敗時為 None，改用 LineExtractor._extract_numpy。
+# 不使用 parallel=True：多個 session 的執行緒會同時呼叫，numba 退回 workqueue 執行緒層時會直接 abort 整個行程；
+# 單張圖片只有數百個抽樣列，平行化的收益也有限
+_extract_kernel = None
+if njit is not None:
+    try:
+        @njit(cache=True, inline='always')
+        def _reflect101_at(i, n):
+            if n == 1:
+                return 0
+            i = abs(i)
+            return 2 * (n - 1) - i if i >= n else i
+
+        @njit(cache=True, inline='always')
+        def _abs_sobel_y_at(gray, y, x, left, right):
+            """單一像素的 |Sobel dy|，與 LineExtractor._abs_sobel_y_columns 相同（BORDER_REFLECT_101）"""
+            H = gray.shape[0]
+            up = _reflect101_at(y - 1, H)
+            down = _reflect101_at(y + 1, H)
+            s_down = np.int32(gray[down, left]) + 2 * np.int32(gray[down, x]) + np.int32(gray[down, right])
+            s_up = np.int32(gray[up, left]) + 2 * np.int32(gray[up, x]) + np.int32(gray[up, right])
+            return abs(s_down - s_up)
+
+        @njit(cache=True, inline='always')
+        def _best_y_at(gray, y0, win, step, x, left, right):
+            """自 y0 起沿 step 方向 win 步內梯度最大的 y（同分取第一個，與 np.argmax 一致）"""
+            H = gray.shape[0]
+            best_y = min(max(y0, 0), H - 1)
+            best = -1
+            for k in range(win):
+                y = min(max(y0 + step * k, 0), H - 1)
+                g = _abs_sobel_y_at(gray, y, x, left, right)
+                if g > best:
+                    best = g
+                    best_y = y
+            return best_y
+
+        @njit(cache=True)
+        def _extract_kernel(gray, cols, xs, win_top, win_bottom):
+            """
+            每個抽樣列：找遮罩上下緣，並只在搜尋視窗內計算梯度求出貼齊血管壁的 y。
+            回傳 (N, 3) 的 (x, top, bottom) 與各列是否有遮罩。
+            """
+            H, W = gray.shape
+            N = xs.size
+            out = np.empty((N, 3), dtype=np.int32)
+            valid = np.zeros(N, dtype=np.bool_)
+            for i in range(N):
+                top = -1
+                for y in range(H):
+                    if cols[y, i]:
+                        top = y
+                        break
+                if top < 0:
+                    continue
+                bottom = top
+                for y in range(H - 1, top - 1, -1):
+                    if cols[y, i]:
+                        bottom = y
+                        break
+                x = xs[i]
+                left = _reflect101_at(x - 1, W)
+                right = _reflect101_at(x + 1, W)
+                out[i, 0] = x
+                out[i, 1] = _best_y_at(gray, top, win_top, 1, x, left, right)
+                out[i, 2] = _best_y_at(gray, bottom, win_bottom, -1, x, left, right)
+                valid[i] = True
+            return out, valid
+    except Exception as e:
+        # 例如 cache=True 找不到可寫入的快取目錄（唯讀掛載、沒有 home 目錄）
+        _extract_kernel = None
+        print(f"numba 核心建立失敗，改用 NumPy: {e}")
+
+def _run_kernel(gray, cols, xs, win_top, win_bottom):
+    """呼叫 numba 核心；第一次呼叫時編譯（或讀取快取），失敗時停用核心並回傳 None"""
+    global _extract_kernel
+    try:
+        return _extract_kernel(gray, cols, xs, win_top, win_bottom)
+    except Exception as e:
+        _extract_kernel = None
+        print(f"numba 核心執行失敗，之後改用 NumPy: {e}")
+        return None
+
+def warmup_kernel():
+    """以與實際呼叫相同的型別執行一次 numba 核心，讓 JIT 編譯在載入階段完成，而不是落在第一個使用者請求"""
+    if _extract_kernel is None:
+        return
+    gray = np.zeros((8, 8), dtype=np.uint8)
+    cols = np.ones((8, 2), dtype=np.bool_)
+    _run_kernel(gray, cols, np.array([2, 5], dtype=np.int32), 1, 1)
+
 class LineExtractor:
     """
     從血管分割遮罩產生垂直線，
     並利用原始影像的灰階梯度，讓線貼齊血管壁。
     支援區域限制功能。
     """
-    clahe = cv2.createCLAHE(clipLimit=4.0, tileGridSize=(16, 16))
-    
+
     def extract_vertical_lines_from_mask(
         self,
         img: np.ndarray,
@@ -54,41 +198,81 @@ class LineExtractor:
             mask = mask[y0:y0 + h_reg, x0:x0 + w_reg]
 
         # 灰階／CLAHE
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img.copy()
-        gray = self.clahe.apply(gray)
+        gray = _enhanced_gray(img)
 
         H, W = gray.shape[:2]
 
-        # 二值化遮罩（支援 0/1 或 0-255）
-        if mask.dtype == np.bool_:
-            binm = mask.astype(np.uint8)
-        else:
-            binm = (mask > 127) if mask.max() > 1 else (mask > 0.5)
-            binm = binm.astype(np.uint8)
-
-        # 決定抽樣 x 範圍
+        # 決定抽樣 x 範圍 [x_start, x_end)，border 只計算一次
+        x_start, x_end = 0, W
         if keep_ratio is not None and region is None:
             border = int((1.0 - float(keep_ratio)) / 2.0 * W)
-            xs = np.arange(border, W - border, sample_interval, dtype=np.int32)
-        else:
-            xs = np.arange(0, W, sample_interval, dtype=np.int32)
+            x_start, x_end = border, W - border
+        xs = np.arange(x_start, x_end, sample_interval, dtype=np.int32)
 
         if xs.size == 0:
             return []
 
-        # 取出每個被抽樣列的遮罩（H x M）
-        cols = binm[:, xs]
-        has_mask = cols.any(axis=0)
-        if not np.any(has_mask):
-            return []
+        # 被抽樣列的遮罩以 strided slice 取得（view，不像 mask[:, xs] 會先複製一份），
+        # 再二值化（支援 bool、0/1 或 0-255），不必轉換整張遮罩
+        cols = mask[:, x_start:x_end:sample_interval]
+        if cols.dtype != np.bool_:
+            cols = (cols > 127) if mask.max() > 1 else (cols > 0.5)
+
+        kernel_out = None
+        if _extract_kernel is not None:
+            # numba：逐列處理，梯度只計算搜尋視窗內的像素
+            kernel_out = _run_kernel(
+                np.ascontiguousarray(gray), np.ascontiguousarray(cols), xs,
+                max(1, int(gradient_search_top)), max(1, int(gradient_search_bottom)),
+            )
+        if kernel_out is not None:
+            lines_arr, valid = kernel_out
+            if not valid.any():
+                return []
+            lines_arr = lines_arr[valid]
+        else:
+            lines_arr = LineExtractor._extract_numpy(gray, cols, xs, gradient_search_top, gradient_search_bottom)
+            if lines_arr is None:
+                return []
+
+        if region is not None:
+            lines_arr[:, 0] += x0
+            lines_arr[:, 1:] += y0
+
+        # 在這裡套用平滑過濾（直接傳入陣列，只在最後轉成 tuple 一次）
+        if apply_smoothing:
+            return LineExtractor._filter_with_smoothing(
+                lines_arr,
+                window_size=smooth_window_size,
+                threshold=smooth_threshold
+            )
+
+        return [tuple(row) for row in lines_arr.tolist()]
+
+    @staticmethod
+    def _extract_numpy(
+        gray: np.ndarray,
+        cols: np.ndarray,
+        xs: np.ndarray,
+        gradient_search_top: int,
+        gradient_search_bottom: int,
+    ) -> Optional[np.ndarray]:
+        """NumPy 向量化版本：回傳 (N, 3) int32 的 (x, top, bottom)；沒有任何列含遮罩時回傳 None"""
+        H = gray.shape[0]
+        # argmax 對 bool 回傳第一個 True（全 False 時為 0），再讀回該位置即可判斷此列是否有遮罩，
+        # 省去另外一次 any() 掃描
+        top0 = np.argmax(cols, axis=0)
+        has_mask = cols[top0, np.arange(xs.size)]
+        if not has_mask.any():
+            return None
 
         xs = xs[has_mask]
-        top0 = np.argmax(cols, axis=0)[has_mask]
-        bot0 = H - 1 - np.argmax(np.flipud(cols), axis=0)[has_mask]
+        top0 = top0[has_mask]
+        bot0 = H - 1 - np.argmax(cols[::-1, has_mask], axis=0)
 
-        # 計算垂直梯度的絕對值 |dI/dy|
-        gy = cv2.Sobel(gray, cv2.CV_32F, dx=0, dy=1, ksize=3)
-        gy = np.abs(gy)
+        # 只在抽樣的列上計算垂直梯度的絕對值 |dI/dy|（H x M，第 j 欄對應 xs[j]）
+        gy = LineExtractor._abs_sobel_y_columns(gray, xs)
+        col_idx = np.arange(xs.size)[:, None]
 
         # 在每列的局部 window 中找最大梯度對應的 y（向量化）
         def best_y_around(y0s: np.ndarray, win: int, direction: int) -> np.ndarray:
@@ -97,51 +281,55 @@ class LineExtractor:
             offsets = (k if direction > 0 else -k)
             ys = y0s[:, None] + offsets
             ys = np.clip(ys, 0, H - 1)
-            xs_mat = np.broadcast_to(xs[:, None], ys.shape)
-            vals = gy[ys, xs_mat]
+            vals = gy[ys, col_idx]
             idx = np.argmax(vals, axis=1)
             return ys[np.arange(ys.shape[0]), idx]
 
-        top = best_y_around(top0.astype(np.int32), gradient_search_top, +1).astype(np.int32)
-        bot = best_y_around(bot0.astype(np.int32), gradient_search_bottom, -1).astype(np.int32)
+        # 預先配置 (N, 3) int32 陣列，直接寫入 x / top / bottom
+        lines_arr = np.empty((xs.size, 3), dtype=np.int32)
+        lines_arr[:, 0] = xs
+        lines_arr[:, 1] = best_y_around(top0.astype(np.int32), gradient_search_top, +1)
+        lines_arr[:, 2] = best_y_around(bot0.astype(np.int32), gradient_search_bottom, -1)
+        return lines_arr
 
-        # 合併成 (x, top, bot) 並將 region 偏移加回去（若有）
-        lines_arr = np.stack([xs.astype(np.int32),
-                            top.astype(np.int32),
-                            bot.astype(np.int32)], axis=1)
-
-        if region is not None:
-            lines_arr[:, 0] += x0
-            lines_arr[:, 1] += y0
-            lines_arr[:, 2] += y0
-
-        lines: List[Tuple[int, int, int]] = [tuple(map(int, row)) for row in lines_arr.tolist()]
+    @staticmethod
+    def _reflect101(idx: np.ndarray, n: int) -> np.ndarray:
+        """與 cv2.BORDER_REFLECT_101 相同的邊界索引映射（-1 -> 1，n -> n-2）"""
+        if n == 1:
+            return np.zeros_like(idx)
+        idx = np.abs(idx)
+        return np.where(idx >= n, 2 * (n - 1) - idx, idx)
 
-        # 在這裡套用平滑過濾
-        if apply_smoothing and len(lines) > 0:
-            lines = LineExtractor._filter_with_smoothing(
-                lines,
-                window_size=smooth_window_size,
-                threshold=smooth_threshold
-            )
-          
-        return lines
+    @staticmethod
+    def _abs_sobel_y_columns(gray: np.ndarray, xs: np.ndarray) -> np.ndarray:
+        """
+        只對 xs 這些列計算 |cv2.Sobel(gray, dx=0, dy=1, ksize=3)|，結果與整張圖計算後取 [:, xs] 相同。
+        3x3 Sobel 可拆成水平平滑 [1, 2, 1] 與垂直差分 [-1, 0, 1]，因此只需讀取 xs 與左右相鄰的三列。
+        """
+        H, W = gray.shape[:2]
+        left = LineExtractor._reflect101(xs - 1, W)
+        right = LineExtractor._reflect101(xs + 1, W)
+        # 水平平滑（int32 避免溢位）
+        sm = gray[:, left].astype(np.int32) + 2 * gray[:, xs].astype(np.int32) + gray[:, right]
+        rows = np.arange(H)
+        up = LineExtractor._reflect101(rows - 1, H)
+        down = LineExtractor._reflect101(rows + 1, H)
+        return np.abs(sm[down] - sm[up])
 
     @staticmethod
     def _filter_with_smoothing(
-        lines: List[Tuple[int, int, int]],
+        lines: Union[List[Tuple[int, int, int]], np.ndarray],
         window_size: int = 5,
         threshold: float = 0.2
     ) -> List[Tuple[int, int, int]]:
         """
         使用滑動視窗（moving average）來平滑並濾除異常線段。
-        支援奇/偶 window_size；O(N) 前綴和實作。
+        支援奇/偶 window_size；O(N) 前綴和實作。lines 可為 list 或 (N, 3) 陣列。
         """
-        if not lines or window_size <= 1:
-            return list(lines)
-
-        # (N, 3)
-        arr = np.asarray(lines, dtype=np.int32)
+        # (N, 3)；已是 int32 陣列時不複製
+        arr = np.asarray(lines, dtype=np.int32).reshape(-1, 3)
+        if arr.shape[0] == 0 or window_size <= 1:
+            return [tuple(row) for row in arr.tolist()]
         heights = (arr[:, 2] - arr[:, 1]).astype(np.float32)
         N = heights.size
         w = int(window_size)
@@ -172,4 +360,4 @@ class LineExtractor:
         keep_mask = rel_diff <= float(threshold)
         filtered = arr[keep_mask]
 
-        return [tuple(map(int, row)) for row in filtered.tolist()]
\ No newline at end of file
+        return [tuple(row) for row in filtered.tolist()]
\ No newline at end of file
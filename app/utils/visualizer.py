@@ -44,10 +44,23 @@ class Visualizer:
                 cv2.circle(overlay, (x, min_y), point_radius, min_point_color, -1)
                 cv2.circle(overlay, (x, max_y), point_radius, max_point_color, -1)
         
+        if len(lines) == 0:
+            return overlay
+
+        # 只有線條外框範圍內的像素被改動，混合只需處理這塊區域（框外 overlay 與原圖相同）
+        arr = np.asarray(lines, dtype=np.int64).reshape(-1, 3)
+        pad = line_thickness + (point_radius if show_points else 0) + 1
+        h, w = image.shape[:2]
+        x0, x1 = max(int(arr[:, 0].min()) - pad, 0), min(int(arr[:, 0].max()) + pad + 1, w)
+        y0, y1 = max(int(arr[:, 1:].min()) - pad, 0), min(int(arr[:, 1:].max()) + pad + 1, h)
+        if x0 >= x1 or y0 >= y1:
+            return overlay
+
         # 將透明層與原圖混合
-        result_image = cv2.addWeighted(image, 1-line_alpha, overlay, line_alpha, 0)
+        roi = (slice(y0, y1), slice(x0, x1))
+        overlay[roi] = cv2.addWeighted(image[roi], 1-line_alpha, overlay[roi], line_alpha, 0)
         
-        return result_image
+        return overlay
    
     @staticmethod
     def visualize_vertical_lines_with_mm(
@@ -97,7 +110,7 @@ class Visualizer:
 
         # 標出平均長度
         if lengths_mm:
-            avg = float(np.mean(lengths_mm))
+            avg = sum(lengths_mm) / len(lengths_mm)
             bottom_text = f"Mean length: {avg:.2f} mm"
             (tw, th), _ = cv2.getTextSize(bottom_text, font, bottom_font_scale, font_thickness)
 
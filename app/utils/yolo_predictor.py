@@ -1,4 +1,5 @@
 import gc
+import hashlib
 import os
 import sys
 from pathlib import Path
@@ -16,6 +17,11 @@ sys.path.insert(0, str(parent_dir))
 
 from yolov13.ultralytics import YOLO
 
+def _file_digest(path: Path) -> "hashlib.blake2b":
+    """檔案內容的 blake2b（8 bytes）摘要，可再 update 其他參數"""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=8))
+
 class YOLOPredictor:
     """YOLO預測器類別"""
     
@@ -27,6 +33,124 @@ class YOLOPredictor:
             weights_path: 模型權重文件路徑
         """
         self.model = YOLO(str(weights_path), task="segment")
+        # 權重內容摘要：作為推論結果快取的模型識別（同名檔案被替換時快取自動失效）
+        self.model_id = _file_digest(weights_path).hexdigest()
+    
+    @staticmethod
+    def export_tensorrt(weights_path: Path, imgsz: int, batch: int) -> Optional[Path]:
+        """
+        匯出 TensorRT FP16 engine 並快取於權重旁；
+        檔名帶有（權重內容、imgsz、batch、GPU 型號、TensorRT 版本）的雜湊，任一項改變時自動重新匯出
+        
+        Args:
+            weights_path: 模型權重文件路徑
+            imgsz: 推論輸入尺寸
+            batch: 最大批次大小（dynamic engine，較小的批次也可使用）
+        
+        Returns:
+            engine 路徑；匯出失敗時回傳 None
+        """
+        weights_path = Path(weights_path)
+        # 以內容雜湊而非 mtime 判斷：複製或部署時 mtime 可能被保留或改寫
+        digest = _file_digest(weights_path)
+        digest.update(f"{imgsz}x{batch}".encode())
+        # engine 只能在同一型號 GPU、同版本 TensorRT 上使用（換機器或升級後需重新匯出）
+        digest.update(YOLOPredictor._tensorrt_target().encode())
+        engine_path = weights_path.with_name(f"{weights_path.stem}.{digest.hexdigest()}.engine")
+        if engine_path.exists():
+            return engine_path
+        try:
+            exported = YOLO(str(weights_path), task="segment").export(
+                format="engine", half=True, dynamic=True, imgsz=imgsz, batch=batch, device=0
+            )
+            return Path(exported).replace(engine_path)
+        except Exception as e:
+            print(f"TensorRT 匯出失敗，使用 PyTorch 權重: {e}")
+            return None
+    
+    @staticmethod
+    def _tensorrt_target() -> str:
+        """目前的 GPU 型號與 TensorRT 版本（無法取得時為空字串）"""
+        gpu = torch.cuda.get_device_name(0) if torch.cuda.is_available() else ""
+        try:
+            import tensorrt
+            version = tensorrt.__version__
+        except ImportError:
+            version = ""
+        return f"{gpu}|{version}"
+    
+    def warmup(self, image_size: Tuple[int, int], runs: int = 3, **kwargs) -> None:
+        """
+        以空白影像預跑數次推論，讓模型初始化與 CUDA kernel 選擇在載入時完成
+        
+        Args:
+            image_size: 預跑影像尺寸 (寬, 高)
+            runs: 預跑次數
+            **kwargs: 傳給 predict 的參數（與實際推論相同，例如 half=True）；
+                以 kwargs["batch"] 張空白影像組成一批，與實際推論的批次大小相同
+        """
+        dummy = np.zeros((image_size[1], image_size[0], 3), dtype=np.uint8)
+        batch = [dummy] * max(int(kwargs.get("batch", 1)), 1)
+        for _ in range(runs):
+            self.predict(batch, **kwargs)
+        self.clear_cache()
+    
+    def _torch_backend(self):
+        """predictor 的 AutoBackend（其 .model 為 PyTorch nn.Module 時）；TensorRT engine 或尚未建立時為 None"""
+        predictor = getattr(self.model, "predictor", None)
+        backend = getattr(predictor, "model", None)
+        if backend is None or not isinstance(getattr(backend, "model", None), torch.nn.Module):
+            return None
+        return backend
+    
+    def to_channels_last(self) -> bool:
+        """
+        將卷積權重改為 channels_last (NHWC)：FP16 卷積在 Tensor Core 上以 NHWC 執行，
+        cuDNN 不必在每層前後轉換格式（需先執行過一次 predict 以建立 predictor）
+        
+        Returns:
+            是否轉換成功
+        """
+        backend = self._torch_backend()
+        if backend is None or not torch.cuda.is_available():
+            return False
+        backend.model.to(memory_format=torch.channels_last)
+        return True
+    
+    def compile(self, image_size: Tuple[int, int], mode: str = "default", runs: int = 1, **kwargs) -> bool:
+        """
+        以 torch.compile 編譯推論用的 nn.Module 並預跑（需先執行過一次 predict 以建立 predictor）。
+        torch.compile 是惰性的，實際編譯（及 Inductor / Triton 的錯誤）發生在第一次前向傳遞，
+        因此預跑也在 try 內：任何失敗都還原為 eager 模組。
+        
+        Args:
+            image_size: 預跑影像尺寸 (寬, 高)
+            mode: torch.compile 模式
+            runs: 每個批次大小的預跑次數
+            **kwargs: 傳給 predict 的參數（與實際推論相同）
+        
+        Returns:
+            是否編譯成功；失敗時維持 eager 模式
+        """
+        backend = self._torch_backend()
+        if backend is None:
+            return False
+        eager = backend.model
+        batch = max(int(kwargs.get("batch", 1)), 1)
+        # 完整批次之後再跑一個較小的尾批：第二種批次大小讓 dynamo 把批次維度標為動態，
+        # 之後任何大小的尾批都不必重新編譯；dynamo 對大小 1 另外特化，單張也先編譯好
+        sizes = sorted({batch, min(batch, 2), 1}, reverse=True)
+        try:
+            backend.model = torch.compile(eager, mode=mode, fullgraph=False)
+            for size in sizes:
+                self.warmup(image_size, runs=runs, **{**kwargs, "batch": size})
+            return True
+        except Exception as e:
+            print(f"torch.compile 失敗，使用 eager 模式: {e}")
+            backend.model = eager
+            torch._dynamo.reset()
+            self.clear_cache()
+            return False
     
     def clear_cache(self):
         if torch.cuda.is_available():
@@ -36,11 +160,18 @@ class YOLOPredictor:
         
     def predict(
       self,
-      source: Union[Path, str, np.ndarray, list],
+      source: Union[Path, str, np.ndarray, torch.Tensor, list],
       task: str = "segment",
       to_cpu: bool = True,
       **kwargs
     ) -> List[Any]:
+        """
+        執行推論
+
+        source 可為路徑、np.ndarray（BGR）、PIL 圖片或其 list；也可直接傳入已在 GPU 上的
+        (N,3,H,W) float tensor（RGB、0-1、H/W 為 32 的倍數），此時 ultralytics 不再做 letterbox、
+        堆疊與上傳，但也不會縮放到 imgsz，需由呼叫端先處理成模型輸入尺寸
+        """
         def to_model_input(x):
             # 保留 path/str 原樣（模型會讀取檔案路徑）
             if isinstance(x, (Path, os.PathLike, str)):
@@ -59,10 +190,10 @@ class YOLOPredictor:
             src_arg = str(source)
         elif isinstance(source, str):
             src_arg = source
-        elif isinstance(source, np.ndarray):
+        elif isinstance(source, (np.ndarray, torch.Tensor)):
             src_arg = source
         else:
-            raise TypeError(f"Unsupported type for source: {type(source)}. Expect Path, str, np.ndarray, or list[...]")
+            raise TypeError(f"Unsupported type for source: {type(source)}. Expect Path, str, np.ndarray, torch.Tensor, or list[...]")
 
         with torch.inference_mode():
             results_iter = self.model.predict(
@@ -78,6 +209,7 @@ class YOLOPredictor:
             return res
         
     @staticmethod
+    @torch.inference_mode()
     def extract_max_confidence_segment(result) -> Tuple[Optional[np.ndarray], Optional[float], Optional[np.ndarray]]:
         """
         從YOLO預測結果中提取最高信心度的檢測區域和分割遮罩
@@ -103,11 +235,51 @@ class YOLOPredictor:
         max_conf_box = boxes[max_conf_index]
         max_confidence = confidences[max_conf_index]
         
-        # 提取對應的分割遮罩
+        # 提取對應的分割遮罩：在原裝置上先二值化成 uint8（0/1）再搬回 CPU，傳輸量為 float32 的 1/4，
+        # 且只搬最高信心的那一張
         if hasattr(result, 'masks') and result.masks is not None:
-            max_conf_mask = result.masks.data[max_conf_index].cpu().numpy()
+            max_conf_mask = (result.masks.data[max_conf_index] > 0.5).to(torch.uint8).cpu().numpy()
         else:
             max_conf_mask = None
             print("沒有找到分割遮罩數據")
         
-        return max_conf_box, max_confidence, max_conf_mask
\ No newline at end of file
+        return max_conf_box, max_confidence, max_conf_mask
+
+    @staticmethod
+    @torch.inference_mode()
+    def extract_max_confidence_masks(results: List[Any]) -> List[Tuple[Optional[float], Optional[np.ndarray]]]:
+        """
+        批次版 extract_max_confidence_segment：每個結果取最高信心的遮罩，在 GPU 上二值化並堆疊後
+        一次搬回 CPU（整批只同步兩次，而非每張圖各自搬運信心度、邊界框與遮罩）
+        
+        Args:
+            results: predict(..., to_cpu=False) 的結果 list
+        
+        Returns:
+            與 results 對齊的 (信心度, uint8 遮罩) list；沒有偵測或遮罩時為 (None, None)
+        """
+        picked: List[int] = []
+        confs = []
+        masks = []
+        for i, result in enumerate(results):
+            if len(result.boxes) == 0 or getattr(result, 'masks', None) is None:
+                continue
+            conf = result.boxes.conf
+            idx = conf.argmax()
+            picked.append(i)
+            confs.append(conf[idx])
+            masks.append(result.masks.data[idx] > 0.5)
+
+        out: List[Tuple[Optional[float], Optional[np.ndarray]]] = [(None, None)] * len(results)
+        if not picked:
+            return out
+
+        confs_np = torch.stack(confs).float().cpu().numpy()
+        if all(m.shape == masks[0].shape for m in masks):
+            masks_np = list(torch.stack(masks).to(torch.uint8).cpu().numpy())
+        else:
+            # 遮罩尺寸不一致（輸入圖片尺寸不同）時逐張搬運
+            masks_np = [m.to(torch.uint8).cpu().numpy() for m in masks]
+        for i, conf, mask in zip(picked, confs_np, masks_np):
+            out[i] = (float(conf), mask)
+        return out
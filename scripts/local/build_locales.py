@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+"""
+Build MessagePack locale bundles from the JSON sources.
+
+Usage: python scripts/local/build_locales.py
+
+app/config/locales/<code>.json is the editable source; this script packs
+everything the app loads at runtime into one blob next to them:
+
+  locales.bin   concatenated zlib-compressed MessagePack sections
+  locales.idx   JSON index {section: [offset, length]}
+
+The app mmaps locales.bin once and decodes a section only when it is first
+needed. Sections:
+
+  <code>        labels shared by the sidebar and several pages
+  <code>.<page> labels only one page uses (PAGE_SECTIONS), merged into the
+                lookup the first time that page asks for one of them
+  page_keys     {key: page} index for the sections above
+  sources       {code: blake2b of <code>.json}, checked at startup when
+                SEG_VALIDATE_I18N=1 (scripts/local/dev.sh sets it)
+  <code>.help   tooltip/placeholder/warning strings (HELP_SUFFIXES)
+  affixes       {key: prefix} of the Markdown header / leading emoji shared
+                by every locale; stripped from the sections above and
+                prepended again at load time
+  colors        color names (COLOR_PREFIX) of every language, as one
+                {code: {key: label}} map
+
+It also regenerates app/config/label_keys.py, an IntEnum K whose members
+follow the key order of the reference locale (zh); get_labels() returns each
+language as a tuple in that order, so hot UI code can index labels[K.X].
+That tuple is emitted as app/config/locales/_loc_<code>.py (a single
+LABELS literal), so loading it is a plain import of one tuple literal instead
+of a zlib + MessagePack decode. No .pyc is shipped: the container runs with
+PYTHONDONTWRITEBYTECODE=1 and a read-only app/ mount, so the module is compiled
+from source on each start.
+
+After writing, the blob and label modules are read back and compared with the
+JSON sources; the build fails if any language does not round-trip.
+
+Run it after editing any locale JSON.
+
+The build aborts without writing anything if any locale is missing keys,
+has extra keys, or uses different format placeholders or a different
+Markdown header / leading emoji prefix than the reference locale (zh), or if
+the locale files do not match LANGUAGE_CODES in app/config/language.py.
+"""
+import ast
+import hashlib
+import re
+import string
+import zlib
+from pathlib import Path
+
+import msgspec
+
+LOCALES_DIR = Path(__file__).resolve().parents[2] / "app" / "config" / "locales"
+REFERENCE_LANGUAGE = "zh"
+LABEL_KEYS_PATH = LOCALES_DIR.parent / "label_keys.py"
+LANGUAGE_MODULE_PATH = LOCALES_DIR.parent / "language.py"
+# Must match HELP_SUFFIXES / COLOR_PREFIX in app/config/language.py
+HELP_SUFFIXES = ("_help", "_placeholder", "_warning")
+COLOR_PREFIX = "color_"
+APP_DIR = LOCALES_DIR.parents[1]
+# Page sections and the UI modules (relative to app/) that render them. A key
+# goes into a section when every get_text('<key>') literal is in that section's
+# modules; keys used anywhere else, or only dynamically, stay in <code>.
+PAGE_SECTIONS = {
+    "images": ("ui/image.py", "ui/google_img_update.py", "ui/canvas.py"),
+    "videos": ("ui/video.py", "ui/google_video_update.py", "ui/video_intervals.py"),
+}
+GET_TEXT_RE = re.compile(r"""get_text\(\s*['"](\w+)['"]""")
+# Markdown header and/or leading emoji followed by whitespace, e.g. "### ⏱️ ", "✅ "
+AFFIX_RE = re.compile(r"^(?:#{1,6} )?(?:[^\w\s{}\[\]()]+\s+)?")
+
+
+def _placeholders(text: str) -> set:
+    """Return the str.format field names used in text."""
+    return {field for _, field, _, _ in string.Formatter().parse(text) if field is not None}
+
+
+def _prefix(text: str) -> str:
+    """Return the structural prefix (header marker / emoji) of text."""
+    return AFFIX_RE.match(text).group()
+
+
+def page_keys(keys: list) -> dict:
+    """Map each key whose literal get_text() uses all sit in one page section to that section."""
+    used_in = {}
+    for path in APP_DIR.rglob("*.py"):
+        module = path.relative_to(APP_DIR).as_posix()
+        for key in GET_TEXT_RE.findall(path.read_text(encoding="utf-8")):
+            used_in.setdefault(key, set()).add(module)
+    index = {}
+    for key in keys:
+        if key.endswith(HELP_SUFFIXES) or key.startswith(COLOR_PREFIX) or key not in used_in:
+            continue
+        for section, modules in PAGE_SECTIONS.items():
+            if used_in[key] <= set(modules):
+                index[key] = section
+                break
+    return index
+
+
+def declared_languages() -> tuple:
+    """Read the LANGUAGE_CODES literal from app/config/language.py without importing it."""
+    tree = ast.parse(LANGUAGE_MODULE_PATH.read_text(encoding="utf-8"))
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "LANGUAGE_CODES" for target in node.targets
+        ):
+            return ast.literal_eval(node.value)
+    raise SystemExit(f"LANGUAGE_CODES not found in {LANGUAGE_MODULE_PATH}")
+
+
+def validate(tables: dict) -> list:
+    """Compare every locale with the reference locale; return a list of problems."""
+    reference = tables[REFERENCE_LANGUAGE]
+    required = frozenset(reference)
+    # The reference signature of every key is computed once, not once per locale
+    signatures = {key: (_placeholders(text), _prefix(text)) for key, text in reference.items()}
+    problems = []
+    for lang, table in tables.items():
+        if lang == REFERENCE_LANGUAGE:
+            continue
+        missing = required - table.keys()
+        extra = table.keys() - required
+        if missing:
+            problems.append(f"{lang}: missing keys {sorted(missing)}")
+        if extra:
+            problems.append(f"{lang}: extra keys {sorted(extra)}")
+        for key in required & table.keys():
+            placeholders, prefix = signatures[key]
+            text = table[key]
+            if _placeholders(text) != placeholders:
+                problems.append(f"{lang}: placeholders of '{key}' differ from {REFERENCE_LANGUAGE}")
+            if _prefix(text) != prefix:
+                problems.append(f"{lang}: prefix of '{key}' differs from {REFERENCE_LANGUAGE}")
+    return problems
+
+
+def _pack(sections: dict, name: str, value: dict) -> None:
+    packed = msgspec.msgpack.encode(value)
+    sections[name] = zlib.compress(packed, 9)
+    print(f"  {name} ({len(value)} entries, {len(packed)} -> {len(sections[name])} bytes)")
+
+
+def _write_blob(sections: dict, blob_path: Path, index_path: Path) -> None:
+    index, offset = {}, 0
+    for name, data in sections.items():
+        index[name] = [offset, len(data)]
+        offset += len(data)
+    blob_path.write_bytes(b"".join(sections.values()))
+    index_path.write_bytes(msgspec.json.encode(index))
+    print(f"{blob_path.name}: {len(sections)} sections, {offset} bytes")
+
+
+def verify(tables: dict, keys: list, blob_path: Path, index_path: Path) -> list:
+    """Read the written blob and label modules back and compare them with the JSON sources."""
+    index = msgspec.json.decode(index_path.read_bytes())
+    blob = blob_path.read_bytes()
+
+    def section(name: str) -> dict:
+        offset, length = index[name]
+        return msgspec.msgpack.decode(zlib.decompress(blob[offset:offset + length]))
+
+    affixes, colors = section("affixes"), section("colors")
+    problems = []
+    for lang, source in tables.items():
+        table = dict(colors[lang])
+        for name in [lang, f"{lang}.help"] + [f"{lang}.{s}" for s in PAGE_SECTIONS]:
+            table.update({k: affixes.get(k, "") + v for k, v in section(name).items()})
+        if table != source:
+            problems.append(f"{lang}: locales.bin does not round-trip to {lang}.json")
+        namespace = {}
+        exec((LOCALES_DIR / f"_loc_{lang}.py").read_text(encoding="utf-8"), namespace)
+        if namespace["LABELS"] != tuple(source[key] for key in keys):
+            problems.append(f"{lang}: _loc_{lang}.py does not match {lang}.json")
+    return problems
+
+
+def _write_label_keys(keys: list, out: Path) -> None:
+    lines = [
+        "# 由 scripts/local/build_locales.py 自動產生，請勿手動修改",
+        "from enum import IntEnum",
+        "",
+        "",
+        "class K(IntEnum):",
+        '    """翻譯 key 的固定索引，對應 get_labels() 回傳的 tuple"""',
+        "",
+    ]
+    lines += [f"    {key.upper()} = {i}" for i, key in enumerate(keys)]
+    out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(f"label keys -> {out.name} ({len(keys)} members)")
+
+
+def _write_label_module(table: dict, keys: list, out: Path) -> None:
+    lines = [
+        "# 由 scripts/local/build_locales.py 自動產生，請勿手動修改",
+        "LABELS = (",
+    ]
+    lines += [f"    {table[key]!r}," for key in keys]
+    lines.append(")")
+    out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(f"  {out.name} ({len(keys)} labels)")
+
+
+def main() -> None:
+    sources = sorted(LOCALES_DIR.glob("*.json"))
+    if not sources:
+        raise SystemExit(f"No locale JSON found in {LOCALES_DIR}")
+
+    tables = {src.stem: msgspec.json.decode(src.read_bytes()) for src in sources}
+    if REFERENCE_LANGUAGE not in tables:
+        raise SystemExit(f"Reference locale {REFERENCE_LANGUAGE}.json not found in {LOCALES_DIR}")
+    problems = validate(tables)
+    declared = set(declared_languages())
+    if declared != tables.keys():
+        problems.append(
+            f"LANGUAGE_CODES {sorted(declared)} does not match locale files {sorted(tables)}"
+        )
+    if problems:
+        raise SystemExit("Locale validation failed:\n  " + "\n  ".join(problems))
+
+    keys = list(tables[REFERENCE_LANGUAGE])
+    _write_label_keys(keys, LABEL_KEYS_PATH)
+
+    sections = {}
+    # validate() guarantees every locale shares the reference prefix
+    affixes = {
+        key: prefix for key, text in tables[REFERENCE_LANGUAGE].items()
+        if not key.startswith(COLOR_PREFIX) and (prefix := _prefix(text))
+    }
+    _pack(sections, "affixes", affixes)
+    colors = {
+        lang: {k: v for k, v in table.items() if k.startswith(COLOR_PREFIX)}
+        for lang, table in tables.items()
+    }
+    _pack(sections, "colors", colors)
+    pages = page_keys(keys)
+    _pack(sections, "page_keys", pages)
+    _pack(sections, "sources", {
+        src.stem: hashlib.blake2b(src.read_bytes(), digest_size=16).hexdigest() for src in sources
+    })
+
+    for src in sources:
+        table = tables[src.stem]
+        bare = {k: v[len(affixes.get(k, "")):] for k, v in table.items()}
+        primary = {
+            k: v for k, v in bare.items()
+            if not k.endswith(HELP_SUFFIXES) and not k.startswith(COLOR_PREFIX) and k not in pages
+        }
+        help_ = {k: v for k, v in bare.items() if k.endswith(HELP_SUFFIXES)}
+        _pack(sections, src.stem, primary)
+        for section in PAGE_SECTIONS:
+            _pack(sections, f"{src.stem}.{section}", {k: v for k, v in bare.items() if pages.get(k) == section})
+        _pack(sections, f"{src.stem}.help", help_)
+        _write_label_module(table, keys, LOCALES_DIR / f"_loc_{src.stem}.py")
+
+    _write_blob(sections, LOCALES_DIR / "locales.bin", LOCALES_DIR / "locales.idx")
+    problems = verify(tables, keys, LOCALES_DIR / "locales.bin", LOCALES_DIR / "locales.idx")
+    if problems:
+        raise SystemExit("Round-trip check failed:\n  " + "\n  ".join(problems))
+
+
+if __name__ == "__main__":
+    main()
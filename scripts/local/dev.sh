@@ -20,4 +20,5 @@ if ! command -v streamlit >/dev/null 2>&1; then
   exit 1
 fi
 
-streamlit run app/main.py
+# Warn at startup if locale JSON was edited without rebuilding the bundles
+SEG_VALIDATE_I18N=1 streamlit run app/main.py